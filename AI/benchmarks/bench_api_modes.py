@@ -0,0 +1,50 @@
+"""End-to-end cost of cached vs live API mode for a roster fetch and a link lookup.
+
+The RSIStandIn (benchmarks/rsi_standin.py) answers cache-mode calls in 60 ms and live scrapes in
+1200 ms (roughly what starcitizen-api shows for each); two pages are
+missing from the cache to exercise the live fallback.
+Run from the AI directory:
+    python -m benchmarks.bench_api_modes
+"""
+import asyncio
+import time
+
+import cogs.rsi_integration as rsi_integration
+from cogs.rsi_integration import RSIIntegrationCog
+from benchmarks.harness import bench_bot
+from benchmarks.rsi_standin import RSIStandIn
+
+PAGES = 19
+MODE_LATENCY = {'cache': 0.06, 'live': 1.2}
+
+async def main():
+    standin = RSIStandIn(pages=PAGES, mode_latency=MODE_LATENCY, uncached_pages={4, 11})
+    await standin.start()
+
+    async with bench_bot(standin.api_base_url) as bot:
+        api = bot.rsi_api
+        cog = RSIIntegrationCog(bot)
+
+        print(f"{PAGES}-page roster (pages 4 and 11 uncached), cache {MODE_LATENCY['cache'] * 1000:.0f} ms, "
+              f"live {MODE_LATENCY['live'] * 1000:.0f} ms")
+        bulk_mode = rsi_integration.RSI_API_BULK_MODE
+        for label, mode in (('all live (before)', 'live'), (f'bulk {bulk_mode} + fallback', bulk_mode)):
+            rsi_integration.RSI_API_BULK_MODE = mode
+            before = dict(api.mode_requests)
+            start = time.perf_counter()
+            members = await cog.get_org_members()
+            elapsed = time.perf_counter() - start
+            calls = {m: n - before.get(m, 0) for m, n in api.mode_requests.items() if n - before.get(m, 0)}
+            print(f"  roster {label:<24} {elapsed * 1000:7.0f} ms   {len(members)} members   calls {calls}")
+        rsi_integration.RSI_API_BULK_MODE = bulk_mode
+
+        start = time.perf_counter()
+        await cog.get_user_info('NewRecruit')
+        print(f"  /draxon-link lookup (live)       {(time.perf_counter() - start) * 1000:7.0f} ms")
+        print(f"  fallbacks to live: {api.mode_fallbacks}")
+
+        cog.process_pending_links.cancel()
+    await standin.close()
+
+if __name__ == '__main__':
+    asyncio.run(main())
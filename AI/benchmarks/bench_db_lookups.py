@@ -0,0 +1,64 @@
+"""Compare per-call connections against the pooled RSIDatabase connection and the member cache.
+
+Run from the AI directory:
+    python -m benchmarks.bench_db_lookups
+"""
+import random
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from lib.rsi_db import RSIDatabase, decode_raw_data
+
+MEMBER_COUNT = 5000
+LOOKUPS = 20000
+
+def populate(db: RSIDatabase, count: int):
+    """Fill the database with synthetic linked members"""
+    for i in range(count):
+        db.store_member(str(100000 + i), {
+            'handle': f'Citizen_{i}',
+            'sid': str(i),
+            'display': f'Citizen {i}',
+            'org_status': 'Main' if i % 3 else 'Affiliate',
+            'org_rank': 'Employee',
+            'org_stars': i % 6,
+            'verified': True
+        })
+
+def lookup_per_call_connection(db_path: Path, discord_id: str):
+    """The original access pattern: open, query and close per lookup"""
+    with sqlite3.connect(db_path) as conn:
+        cursor = conn.cursor()
+        cursor.execute('SELECT raw_data FROM rsi_members WHERE discord_id = ?', (discord_id,))
+        result = cursor.fetchone()
+        result = decode_raw_data(result[0]) if result else None
+    conn.close()
+    return result
+
+def measure(label: str, lookup, ids):
+    start = time.perf_counter()
+    for discord_id in ids:
+        lookup(discord_id)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {len(ids) / elapsed:>12,.0f} lookups/s")
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / 'bench.db'
+        db = RSIDatabase(db_path)
+        populate(db, MEMBER_COUNT)
+        ids = [str(100000 + random.randrange(MEMBER_COUNT)) for _ in range(LOOKUPS)]
+
+        print(f"{MEMBER_COUNT} members, {LOOKUPS} random lookups")
+        measure("connection per lookup", lambda i: lookup_per_call_connection(db_path, i), ids)
+        # Bypass the member cache so the pooled row measures SQLite, then time the cache itself
+        db.cache.complete = False
+        measure("pooled connection", db.get_member_by_discord_id, ids)
+        db.cache.complete = True
+        measure("member cache", db.get_member_by_discord_id, ids)
+        db.close()
+
+if __name__ == "__main__":
+    main()
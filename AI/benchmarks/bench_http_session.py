@@ -0,0 +1,84 @@
+"""Compare a 10-page roster fetch with a new ClientSession per request vs the shared session.
+
+The RSIStandIn (benchmarks/rsi_standin.py) serves the roster over TLS
+(self-signed certificate made with the openssl CLI; plain HTTP if that is
+missing).
+Run from the AI directory:
+    python -m benchmarks.bench_http_session
+"""
+import asyncio
+import shutil
+import ssl
+import statistics
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+import aiohttp
+
+from lib.constants import RSI_API_VERSION, RSI_ORGANIZATION_SID
+from lib.http_client import create_http_session
+from benchmarks.rsi_standin import RSIStandIn
+
+PAGES = 10
+ROUNDS = 20
+SERVER_LATENCY = 0.005  # Seconds of simulated API processing per page
+
+def make_certificate(tmp: Path):
+    if not shutil.which('openssl'):
+        return None, None
+    cert, key = tmp / 'cert.pem', tmp / 'key.pem'
+    subprocess.run(['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1',
+                    '-subj', '/CN=localhost', '-keyout', str(key), '-out', str(cert)],
+                   check=True, capture_output=True)
+    server_ctx = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    server_ctx.load_cert_chain(cert, key)
+    client_ctx = ssl.create_default_context(cafile=str(cert))
+    return server_ctx, client_ctx
+
+async def fetch_roster(get) -> int:
+    total = 0
+    for page in range(1, PAGES + 1):
+        data = await get({'page': page})
+        total += len(data['data'])
+    return total
+
+async def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        server_ctx, client_ctx = make_certificate(Path(tmp))
+        standin = RSIStandIn(pages=PAGES, latency=SERVER_LATENCY)
+        await standin.start(ssl_context=server_ctx)
+        scheme = 'https' if server_ctx else 'http'
+        url = f'{standin.base_url}/key/{RSI_API_VERSION}/cache/organization_members/{RSI_ORGANIZATION_SID}'
+
+        async def per_request(params):
+            # The previous fetch_api_data pattern
+            connector = aiohttp.TCPConnector(ssl=client_ctx) if client_ctx else None
+            async with aiohttp.ClientSession(connector=connector) as session:
+                async with session.get(url, params=params) as response:
+                    return await response.json()
+
+        shared = create_http_session(ssl_context=client_ctx)
+
+        async def pooled(params):
+            async with shared.get(url, params=params) as response:
+                return await response.json()
+
+        print(f"{PAGES}-page roster fetch over {scheme}, {SERVER_LATENCY * 1000:.0f} ms server latency, "
+              f"{ROUNDS} rounds")
+        for name, get in (('session per request', per_request), ('shared session', pooled)):
+            timings = []
+            for _ in range(ROUNDS):
+                start = time.perf_counter()
+                await fetch_roster(get)
+                timings.append((time.perf_counter() - start) * 1000)
+            timings.sort()
+            print(f"  {name:<20} median {statistics.median(timings):7.1f} ms   "
+                  f"p95 {timings[int(len(timings) * 0.95) - 1]:7.1f} ms")
+
+        await shared.close()
+        await standin.close()
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,47 @@
+"""Measure /draxon-lookup autocomplete latency against 10k linked members.
+
+Run from the AI directory:
+    python -m benchmarks.bench_member_lookup
+"""
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from lib.rsi_db_async import AsyncRSIDatabase
+from benchmarks.bench_member_rows import synthetic_member
+
+MEMBER_COUNT = 10000
+SAMPLES = 300
+
+QUERY_KINDS = {
+    'short prefix': lambda i: 'Ci',
+    'handle prefix': lambda i: f'Citizen_{i // 10}',
+    'substring': lambda i: f'zen {i}',
+    'typo (fuzzy)': lambda i: f'Ctiizen_{i}',
+}
+
+async def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = AsyncRSIDatabase(Path(tmp) / 'bench.db')
+        await asyncio.gather(*[db.store_member(str(100000 + i), synthetic_member(i))
+                               for i in range(MEMBER_COUNT)])
+
+        print(f"{MEMBER_COUNT} linked members, {SAMPLES} autocomplete calls per kind (3000 ms budget)")
+        for kind, make_query in QUERY_KINDS.items():
+            latencies = []
+            for _ in range(SAMPLES):
+                query = make_query(random.randrange(MEMBER_COUNT))
+                start = time.perf_counter()
+                await db.lookup_members(query, limit=25)
+                latencies.append((time.perf_counter() - start) * 1000)
+            latencies.sort()
+            p95 = latencies[int(len(latencies) * 0.95)]
+            print(f"{kind:<14} p50 {statistics.median(latencies):>6.2f} ms   p95 {p95:>6.2f} ms   "
+                  f"max {latencies[-1]:>6.2f} ms")
+        await db.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,83 @@
+"""Refresh 500 linked members: one user/{handle} call each vs a roster join with lookup fallback.
+
+Of the linked members, 450 are on the 592-member roster with outdated rank
+and stars, 20 are on it without a known main/affiliate status and 30 have
+left the org. Uses the RSIStandIn (benchmarks/rsi_standin.py).
+Run from the AI directory:
+    python -m benchmarks.bench_member_refresh
+"""
+import asyncio
+import time
+from typing import List
+
+from cogs.rsi_integration import RSIIntegrationCog
+from lib.constants import RSI_API_RATE
+from lib.profile_cache import ProfileCache
+from lib.rsi_api import PRIORITY_BACKGROUND
+from lib.rsi_db_async import AsyncRSIDatabase
+from benchmarks.harness import bench_bot
+from benchmarks.rsi_standin import RSIStandIn
+
+PAGES = 19
+LATENCY = 0.02  # Seconds per stand-in response
+ON_ROSTER, NO_STATUS, LEFT = 450, 20, 30
+
+async def seed(db: AsyncRSIDatabase, roster_handles: List[str]):
+    writes = []
+    for n in range(ON_ROSTER + NO_STATUS + LEFT):
+        handle = roster_handles[n] if n < ON_ROSTER + NO_STATUS else f'Former_{n}'
+        writes.append(db.store_member(str(1000 + n), {
+            'discord_id': str(1000 + n), 'handle': handle, 'display': handle, 'sid': str(n),
+            'verified': True, 'org_status': None if ON_ROSTER <= n < ON_ROSTER + NO_STATUS else 'Main',
+            'org_rank': 'Recruit', 'org_stars': 0, 'last_updated': '2024-01-01T00:00:00'
+        }))
+    await asyncio.gather(*writes)
+
+async def per_user(cog: RSIIntegrationCog):
+    # One user/{handle} call per linked member
+    async def refresh(row):
+        response = await cog.get_user_info(row.handle, fresh=True, priority=PRIORITY_BACKGROUND)
+        return response.get('success')
+    rows = [row async for row in cog.db.iter_member_rows()]
+    return sum(1 for ok in await asyncio.gather(*(refresh(row) for row in rows)) if ok)
+
+async def main():
+    standin = RSIStandIn(pages=PAGES, latency=LATENCY)
+    await standin.start()
+
+    def api_calls() -> tuple:
+        return standin.hits['organization_members'], standin.hits['user']
+
+    # bench_bot's limiter is unthrottled so the run is quick; API time is estimated from the call count
+    async with bench_bot(standin.api_base_url) as bot:
+        await seed(bot.rsi_db, standin.roster_handles)
+        cog = RSIIntegrationCog(bot)
+
+        print(f"{ON_ROSTER + NO_STATUS + LEFT} linked members, {PAGES}-page roster, "
+              f"quota {RSI_API_RATE:.0f} req/s")
+        for name, run in (('per-user calls', per_user), ('roster join', RSIIntegrationCog.refresh_linked_members)):
+            standin.hits.clear()
+            cog.profile_cache = ProfileCache()
+            start = time.perf_counter()
+            result = await run(cog)
+            elapsed = (time.perf_counter() - start) * 1000
+            roster, user = api_calls()
+            print(f"  {name:<15} {roster + user:4d} API calls ({roster} roster, {user} user)   "
+                  f"{elapsed:6.0f} ms unthrottled, ~{(roster + user) / RSI_API_RATE:5.1f} s at quota")
+            if isinstance(result, dict):
+                print(f"    {result}")
+
+        # The roster stays cached, so later runs only spend calls on unresolved members
+        for run in ('second', 'third'):
+            standin.hits.clear()
+            cog.profile_cache = ProfileCache()
+            print(f"  {run} join run: {await cog.refresh_linked_members()}, {sum(api_calls())} API calls")
+
+        rows = {row.discord_id: row async for row in bot.rsi_db.iter_member_rows()}
+        print(f"  after: member 1000 {rows['1000'].org_rank}/{rows['1000'].org_stars}*, "
+              f"member {1000 + ON_ROSTER} {rows[str(1000 + ON_ROSTER)].org_status}, "
+              f"member {1000 + ON_ROSTER + NO_STATUS} {rows[str(1000 + ON_ROSTER + NO_STATUS)].org_status}")
+    await standin.close()
+
+if __name__ == '__main__':
+    asyncio.run(main())
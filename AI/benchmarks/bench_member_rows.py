@@ -0,0 +1,67 @@
+"""Compare get_all_members (full JSON decode) against column-projected rows.
+
+Run from the AI directory:
+    python -m benchmarks.bench_member_rows
+"""
+import tempfile
+import time
+from pathlib import Path
+
+from lib.rsi_db import RSIDatabase
+
+MEMBER_COUNT = 50000
+
+def synthetic_member(i: int) -> dict:
+    """A linked member shaped like LinkAccountModal's payload"""
+    profile = {
+        'handle': f'Citizen_{i}',
+        'display': f'Citizen {i}',
+        'id': f'#{i}',
+        'enlisted': '2015-04-01T00:00:00.000000',
+        'badge': 'Citizen',
+        'bio': 'Hauler, miner and occasional bounty hunter. ' * 4,
+        'page': {'title': f'Citizen_{i} | Roberts Space Industries', 'url': f'https://example.invalid/{i}'},
+        'fluency': ['English'],
+        'image': f'https://example.invalid/avatars/{i}.jpg'
+    }
+    org = {'sid': 'DRAXON', 'name': 'DraXon Industries', 'rank': 'Employee', 'stars': i % 6}
+    return {
+        'discord_id': str(100000 + i),
+        'sid': str(i),
+        'handle': profile['handle'],
+        'display': profile['display'],
+        'verified': True,
+        'enlisted': profile['enlisted'],
+        'org_sid': 'DRAXON',
+        'org_name': org['name'],
+        'org_rank': org['rank'],
+        'org_stars': org['stars'],
+        'org_status': 'Main' if i % 3 else 'Affiliate',
+        'raw_profile': profile,
+        'raw_org': org
+    }
+
+def populate(db: RSIDatabase, count: int):
+    for i in range(count):
+        db.store_member(str(100000 + i), synthetic_member(i))
+
+def measure(label: str, func, repeat: int = 3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<32} {best * 1000:>9.1f} ms  ({len(result)} rows)")
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = RSIDatabase(Path(tmp) / 'bench.db')
+        populate(db, MEMBER_COUNT)
+
+        print(f"{MEMBER_COUNT} members")
+        measure("get_all_members (full decode)", db.get_all_members)
+        measure("get_member_rows (columns)", db.get_member_rows)
+        db.close()
+
+if __name__ == "__main__":
+    main()
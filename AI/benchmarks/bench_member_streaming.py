@@ -0,0 +1,49 @@
+"""Compare peak memory of get_all_members against streaming iter_members.
+
+Run from the AI directory:
+    python -m benchmarks.bench_member_streaming
+"""
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from lib.rsi_db import RSIDatabase
+from benchmarks.bench_member_rows import populate
+
+MEMBER_COUNT = 50000
+
+def export(make_iterable) -> tuple:
+    """Consume members the way a report builder would, one line at a time"""
+    start = time.perf_counter()
+    first = None
+    lines = 0
+    for member in make_iterable():
+        if first is None:
+            first = time.perf_counter() - start
+        line = f"{member['handle']} | {member['display']} | {member['org_status']}\n"
+        lines += len(line) > 0
+    return first, lines
+
+def measure(label: str, make_iterable):
+    tracemalloc.start()
+    start = time.perf_counter()
+    first, lines = export(make_iterable)
+    total = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<22} peak {peak / 2**20:>7.1f} MiB   first row {first * 1000:>8.1f} ms   "
+          f"total {total * 1000:>7.0f} ms  ({lines} rows)")
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = RSIDatabase(Path(tmp) / 'bench.db')
+        populate(db, MEMBER_COUNT)
+
+        print(f"{MEMBER_COUNT} members")
+        measure("get_all_members", db.get_all_members)
+        measure("iter_members", db.iter_members)
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Time get_org_members, check_status and check_incidents entirely offline.
+
+Runs each check against the RSIStandIn (benchmarks/rsi_standin.py) and
+reports the median time and the longest event-loop stall seen meanwhile,
+first on a healthy stand-in and then with failures injected.
+Run from the AI directory:
+    python -m benchmarks.bench_offline_checks
+"""
+import asyncio
+import statistics
+import time
+
+from cogs.rsi_integration import RSIIntegrationCog
+from cogs.rsi_incidents_monitor import RSIIncidentMonitorCog
+from cogs.rsi_status_monitor import RSIStatusMonitorCog
+from benchmarks.harness import bench_bot
+from benchmarks.rsi_standin import RSIStandIn
+
+PAGES = 19
+LATENCY = 0.05  # Seconds per stand-in response
+ROUNDS = 5
+
+async def max_stall(work) -> tuple:
+    """Run work while a 10 ms ticker measures the longest gap between ticks"""
+    worst = 0.0
+
+    async def ticker():
+        nonlocal worst
+        last = time.perf_counter()
+        while True:
+            await asyncio.sleep(0.01)
+            now = time.perf_counter()
+            worst = max(worst, now - last - 0.01)
+            last = now
+
+    probe = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    try:
+        result = await work()
+    finally:
+        probe.cancel()
+    return result, (time.perf_counter() - start) * 1000, worst * 1000
+
+async def run_checks(label: str, checks: dict):
+    print(label)
+    for name, (work, describe) in checks.items():
+        timings, stalls = [], []
+        for _ in range(ROUNDS):
+            result, elapsed, stall = await max_stall(work)
+            timings.append(elapsed)
+            stalls.append(stall)
+        print(f"  {name:<16} median {statistics.median(timings):7.1f} ms   "
+              f"worst loop stall {max(stalls):7.1f} ms   {describe(result)}")
+
+async def main():
+    standin = RSIStandIn(pages=PAGES, latency=LATENCY)
+    # Served from its own thread so its responses don't count towards the client's loop stalls
+    standin.start_in_thread()
+
+    async with bench_bot(standin.api_base_url, rsi_status_url=standin.status_url,
+                         rsi_incidents_feed_url=standin.feed_url) as bot:
+        rsi_cog = RSIIntegrationCog(bot)
+        status_cog = RSIStatusMonitorCog(bot)
+        incidents_cog = RSIIncidentMonitorCog(bot)
+
+        async def check_incidents():
+            incidents_cog.last_incident_guid = None
+            return await incidents_cog.check_incidents()
+
+        checks = {
+            'get_org_members': (rsi_cog.get_org_members,
+                                lambda members: f"{len(members)} members" if members is not None else "failed"),
+            'check_status': (status_cog.check_status, lambda statuses: f"{dict(statuses)}"),
+            'check_incidents': (check_incidents,
+                                lambda incident: incident['title'] if incident else "no incident")
+        }
+        print(f"Stand-in at {standin.base_url}: {PAGES}-page roster, {LATENCY * 1000:.0f} ms per response, "
+              f"{ROUNDS} rounds")
+        await run_checks("healthy", checks)
+
+        standin.route_error_rate = {'organization_members': 0.2, 'status': 1.0, 'feed': 1.0}
+        await run_checks("20% roster page errors, status site down (503)", checks)
+        print(f"  stand-in hits {dict(standin.hits)}, errors {dict(standin.errors)}")
+
+        incidents_cog.check_incidents_task.cancel()
+        rsi_cog.cog_unload()
+
+    standin.stop_thread()
+
+if __name__ == '__main__':
+    asyncio.run(main())
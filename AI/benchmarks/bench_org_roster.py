@@ -0,0 +1,54 @@
+"""Time get_org_members for a 19-page (600-member) org: sequential paging vs concurrent fetch-ahead.
+
+Uses the RSIStandIn (benchmarks/rsi_standin.py) over plain HTTP.
+Run from the AI directory:
+    python -m benchmarks.bench_org_roster
+"""
+import asyncio
+import statistics
+import time
+
+from cogs.rsi_integration import RSIIntegrationCog
+from lib.constants import RSI_MEMBERS_PER_PAGE, RSI_ORGANIZATION_SID
+from benchmarks.harness import bench_bot
+from benchmarks.rsi_standin import RSIStandIn
+
+PAGES = 19
+LATENCY = 0.08  # Seconds per page, roughly a round trip to the hosted API
+ROUNDS = 5
+
+async def sequential(cog: RSIIntegrationCog):
+    # The previous get_org_members loop
+    members, page = [], 1
+    while True:
+        data = await cog.fetch_api_data(f"organization_members/{RSI_ORGANIZATION_SID}", params={"page": page})
+        if not data or not data.get('data'):
+            break
+        members.extend(data['data'])
+        if len(data['data']) < RSI_MEMBERS_PER_PAGE:
+            break
+        page += 1
+    return members
+
+async def main():
+    standin = RSIStandIn(pages=PAGES, latency=LATENCY)
+    await standin.start()
+    async with bench_bot(standin.api_base_url) as bot:
+        cog = RSIIntegrationCog(bot)
+
+        print(f"{PAGES} pages, {LATENCY * 1000:.0f} ms per page, {ROUNDS} rounds")
+        for name, fetch in (('sequential', sequential), ('concurrent', RSIIntegrationCog.get_org_members)):
+            timings = []
+            for _ in range(ROUNDS):
+                start = time.perf_counter()
+                members = await fetch(cog)
+                timings.append((time.perf_counter() - start) * 1000)
+            print(f"  {name:<11} median {statistics.median(timings):7.1f} ms   {len(members)} members")
+
+        standin.failing_pages = {7}
+        print(f"  page 7 unavailable: sequential returns {len(await sequential(cog))} members, "
+              f"concurrent returns {await cog.get_org_members()}")
+    await standin.close()
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,58 @@
+"""Measure on-disk size and decode cost of the raw_data codec against plain JSON.
+
+Starts from rows in the legacy JSON text format, runs the online recode
+migration and compares file size and full-table decode time.
+
+Run from the AI directory:
+    python -m benchmarks.bench_raw_data_codec
+"""
+import asyncio
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from lib.rsi_db import decode_raw_data
+from lib.rsi_db_async import AsyncRSIDatabase
+from benchmarks.bench_member_rows import synthetic_member
+
+MEMBER_COUNT = 20000
+
+def file_size(db) -> int:
+    conn = db._get_connection()
+    conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+    return os.path.getsize(db.db_path)
+
+def decode_all(db) -> float:
+    rows = db._get_connection().execute('SELECT raw_data FROM rsi_members').fetchall()
+    start = time.perf_counter()
+    for (raw_data,) in rows:
+        decode_raw_data(raw_data)
+    return (time.perf_counter() - start) / len(rows) * 1e6
+
+async def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = AsyncRSIDatabase(Path(tmp) / 'bench.db')
+        await asyncio.gather(*[db.store_member(str(100000 + i), synthetic_member(i))
+                               for i in range(MEMBER_COUNT)])
+
+        # Rewrite every payload in the legacy JSON text format
+        conn = db.db._get_connection()
+        with conn:
+            legacy = [(json.dumps(decode_raw_data(raw)), discord_id)
+                      for discord_id, raw in conn.execute('SELECT discord_id, raw_data FROM rsi_members')]
+            conn.executemany('UPDATE rsi_members SET raw_data = ? WHERE discord_id = ?', legacy)
+        conn.execute('VACUUM')
+        before_size, before_decode = file_size(db.db), decode_all(db.db)
+
+        report = await db.recode_raw_data()
+        after_size, after_decode = file_size(db.db), decode_all(db.db)
+
+        print(f"{MEMBER_COUNT} members, recode: {report}")
+        print(f"json text    {before_size / 2**20:>7.2f} MiB on disk   decode {before_decode:>6.1f} us/row")
+        print(f"zlib codec   {after_size / 2**20:>7.2f} MiB on disk   decode {after_decode:>6.1f} us/row")
+        await db.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
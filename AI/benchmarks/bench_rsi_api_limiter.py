@@ -0,0 +1,50 @@
+"""Show the shared RSI client under contention: rate held, priorities honoured, duplicates merged.
+
+A background sweep queues 40 roster page requests while link lookups
+arrive part-way through; then 10 identical requests are issued at once.
+Run from the AI directory:
+    python -m benchmarks.bench_rsi_api_limiter
+"""
+import asyncio
+import time
+
+from lib.http_client import create_http_session
+from lib.rsi_api import RSIApiClient, TokenBucket, PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND
+from benchmarks.rsi_standin import RSIStandIn
+
+RATE = 20.0
+BURST = 5
+
+async def main():
+    standin = RSIStandIn(pages=40, route_latency={'organization_members': 0.01})
+    await standin.start()
+    session = create_http_session()
+    api = RSIApiClient(session, 'key', base_url=standin.api_base_url,
+                       limiter=TokenBucket(rate=RATE, burst=BURST))
+
+    start = time.perf_counter()
+    sweep = [asyncio.create_task(api.get('organization_members/DRAXON', {'page': page}, PRIORITY_BACKGROUND))
+             for page in range(1, 41)]
+    await asyncio.sleep(0.5)
+    links = [asyncio.create_task(api.get(f'user/Pilot{i}', priority=PRIORITY_INTERACTIVE)) for i in range(5)]
+    await asyncio.gather(*sweep, *links)
+    elapsed = time.perf_counter() - start
+
+    stats = api.stats()
+    print(f"{stats['requests']} requests in {elapsed:.2f}s at {RATE:.0f}/s (burst {BURST}): "
+          f"{stats['requests'] / elapsed:.1f} req/s achieved")
+    for name, wait in stats['wait'].items():
+        if wait['count']:
+            print(f"  {name:<12} {wait['count']:3d} waited   p50 {wait['p50_ms']:6.1f} ms   "
+                  f"p95 {wait['p95_ms']:6.1f} ms   max {wait['max_ms']:6.1f} ms")
+
+    before = api.requests
+    await asyncio.gather(*[api.get('user/SameHandle', priority=PRIORITY_INTERACTIVE) for _ in range(10)])
+    print(f"  10 identical concurrent lookups -> {api.requests - before} request "
+          f"({api.stats()['coalesced']} merged)")
+
+    await session.close()
+    await standin.close()
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,43 @@
+"""Check that re-linking a handle in different case replaces the old link everywhere.
+
+Stores 111/Alpha, then 222/alpha, and compares what the member cache and
+the database each say: both must hold only 222, so the cache never drops
+a row the database still keeps (or the other way round).
+Run from the AI directory:
+    python -m benchmarks.check_handle_relink
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+from lib.rsi_db import RSIDatabase
+
+def main() -> int:
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        db = RSIDatabase(Path(tmp) / 'relink.db')
+        db.store_member('111', {'handle': 'Alpha', 'display': 'Alpha', 'verified': True})
+        db.store_member('222', {'handle': 'alpha', 'display': 'alpha', 'verified': True})
+
+        total = db.get_database_stats().get('total_members')
+        cached = (db.get_member_by_discord_id('111'), db.get_member_by_discord_id('222'))
+        db.cache.complete = False  # Answer the same lookups from SQLite
+        stored = (db.get_member_by_discord_id('111'), db.get_member_by_discord_id('222'))
+        db.close()
+
+    print(f"  total_members {total}")
+    for source, (old, new) in (('cache', cached), ('database', stored)):
+        print(f"  {source:<8} 111 -> {old and old['handle']}, 222 -> {new and new['handle']}")
+        if old is not None or new is None:
+            failures.append(source)
+    if total != 1:
+        failures.append('total_members')
+
+    if failures:
+        print(f"FAIL: stale or missing link in {', '.join(failures)}")
+        return 1
+    print("OK: the case-insensitive re-link replaced the old link in cache and database")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""Check the event loop keeps running while the RSI status site hangs.
+
+The stand-in holds every status page and feed request past the request
+timeout, so check_status and check_incidents spend all their retries
+waiting. Meanwhile a 10 ms ticker stands in for the gateway heartbeat and
+interaction handlers. Exits non-zero if the loop stalled past MAX_STALL.
+Run from the AI directory:
+    python -m benchmarks.check_loop_responsiveness
+"""
+import asyncio
+import sys
+import time
+from types import SimpleNamespace
+
+from cogs.rsi_incidents_monitor import RSIIncidentMonitorCog
+from cogs.rsi_status_monitor import RSIStatusMonitorCog
+from lib.constants import REQUEST_TIMEOUT
+from lib.http_client import create_http_session
+from benchmarks.rsi_standin import RSIStandIn
+
+HANG = REQUEST_TIMEOUT + 5  # Seconds the status site takes to answer
+MAX_STALL = 0.1  # Seconds the loop may go without running the ticker
+TICK = 0.01
+
+async def main() -> int:
+    standin = RSIStandIn(pages=1, route_latency={'status': HANG, 'feed': HANG})
+    standin.start_in_thread()
+    http_session = create_http_session()
+    bot = SimpleNamespace(http_session=http_session, rsi_status_url=standin.status_url,
+                          rsi_incidents_feed_url=standin.feed_url,
+                          wait_until_ready=asyncio.Event().wait)
+    status_cog = RSIStatusMonitorCog(bot)
+    incidents_cog = RSIIncidentMonitorCog(bot)
+
+    ticks, worst = 0, 0.0
+
+    async def ticker():
+        nonlocal ticks, worst
+        last = time.perf_counter()
+        while True:
+            await asyncio.sleep(TICK)
+            now = time.perf_counter()
+            ticks += 1
+            worst = max(worst, now - last - TICK)
+            last = now
+
+    print(f"Status site hangs {HANG}s per request (timeout {REQUEST_TIMEOUT}s, "
+          f"{status_cog.max_retries} attempts per check)")
+    probe = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    statuses, incident = await asyncio.gather(status_cog.check_status(), incidents_cog.check_incidents())
+    elapsed = time.perf_counter() - start
+    probe.cancel()
+
+    print(f"  checks gave up after {elapsed:.1f}s: statuses unchanged {statuses}, incident {incident}")
+    print(f"  ticker ran {ticks} times (~{elapsed / TICK:.0f} expected), worst stall {worst * 1000:.1f} ms")
+    print(f"  stand-in hits {dict(standin.hits)}")
+
+    incidents_cog.check_incidents_task.cancel()
+    await http_session.close()
+    standin.stop_thread()
+
+    if worst > MAX_STALL:
+        print(f"FAIL: event loop stalled {worst * 1000:.0f} ms (limit {MAX_STALL * 1000:.0f} ms)")
+        return 1
+    print("OK: event loop stayed responsive")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,63 @@
+"""Check that every hot RSIDatabase query is served by an index.
+
+Captures the SQL each method really executes, runs EXPLAIN QUERY PLAN on it
+and fails if SQLite falls back to a full table scan or a temporary sort.
+
+Run from the AI directory:
+    python -m benchmarks.explain_hot_queries
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+from lib.rsi_db import RSIDatabase, HISTORY_TABLES
+
+def capture_statements(db: RSIDatabase, func, *args) -> list:
+    """Run func and return the expanded SQL statements it executed"""
+    conn = db._get_connection()
+    statements = []
+    conn.set_trace_callback(statements.append)
+    try:
+        func(*args)
+    finally:
+        conn.set_trace_callback(None)
+    return [s for s in statements if s.lstrip().upper().startswith(('SELECT', 'DELETE', 'UPDATE'))]
+
+def query_plan(db: RSIDatabase, statement: str) -> list:
+    rows = db._get_connection().execute(f'EXPLAIN QUERY PLAN {statement}').fetchall()
+    return [row[3] for row in rows]
+
+def uses_index(plan: list) -> bool:
+    return (any('USING' in step and 'INDEX' in step for step in plan)
+            and not any(step.startswith('SCAN') or 'TEMP B-TREE' in step for step in plan))
+
+def main() -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        db = RSIDatabase(Path(tmp) / 'plans.db')
+        db.store_member('1', {'handle': 'Citizen'})
+        db.log_role_change('1', 'Employee', 'Manager', 'benchmark')
+        # Bypass the member cache so handle lookups reach SQLite
+        db.cache.complete = False
+
+        hot_paths = {
+            'get_member_by_handle': (db.get_member_by_handle, 'citizen'),
+            'get_member_row_by_handle': (db.get_member_row_by_handle, 'CITIZEN'),
+            'get_role_history': (db.get_role_history, '1'),
+            'get_verification_history': (db.get_verification_history, '1'),
+        }
+        for table in HISTORY_TABLES:
+            hot_paths[f'{table} retention'] = (db.delete_history_chunk, table, '2024-01-01', 500)
+
+        failures = 0
+        checks = [(name, s) for name, (func, *args) in hot_paths.items()
+                  for s in capture_statements(db, func, *args)]
+        for name, statement in checks:
+            plan = query_plan(db, statement)
+            ok = uses_index(plan)
+            failures += not ok
+            print(f"{'OK  ' if ok else 'FAIL'} {name}: {'; '.join(plan)}")
+        db.close()
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,34 @@
+"""Bot stand-in shared by the benchmarks that drive the cogs directly.
+
+bench_bot yields a SimpleNamespace with the attributes the cogs read from
+the bot: a shared HTTP session, an RSIApiClient against the given base URL
+with an unthrottled limiter (benchmarks measure the code, not the quota),
+an AsyncRSIDatabase in a temporary directory, and a wait_until_ready that
+never resolves so the cogs' background loops stay idle.
+"""
+import asyncio
+import tempfile
+from contextlib import asynccontextmanager
+from pathlib import Path
+from types import SimpleNamespace
+from typing import AsyncIterator
+
+from lib.http_client import create_http_session
+from lib.rsi_api import RSIApiClient, TokenBucket
+from lib.rsi_db_async import AsyncRSIDatabase
+
+@asynccontextmanager
+async def bench_bot(api_base_url: str, **attrs) -> AsyncIterator[SimpleNamespace]:
+    """Bot stand-in for cogs under benchmark; extra attrs are set on it as given"""
+    http_session = create_http_session()
+    with tempfile.TemporaryDirectory() as tmp:
+        api = RSIApiClient(http_session, 'key', base_url=api_base_url,
+                           limiter=TokenBucket(rate=1000, burst=100))
+        bot = SimpleNamespace(http_session=http_session, rsi_api=api,
+                              rsi_db=AsyncRSIDatabase(Path(tmp) / 'bench.db'),
+                              wait_until_ready=asyncio.Event().wait, **attrs)
+        try:
+            yield bot
+        finally:
+            await bot.rsi_db.close()
+            await http_session.close()
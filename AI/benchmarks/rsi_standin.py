@@ -0,0 +1,219 @@
+"""Offline stand-in for the starcitizen-api endpoints and the RSI status site.
+
+Serves the recorded payloads in benchmarks/fixtures:
+  /{key}/{version}/{mode}/organization_members/{sid}?page=N
+  /{key}/{version}/{mode}/user/{handle}
+  /            status page HTML
+  /index.xml   incident RSS feed
+The roster is built from the recorded page, one generated handle per
+member. Roster handles look up as main members of the org; any other
+handle gets the recorded profile from a different org. Latency, error
+rate and page count are configurable, per route where it matters.
+Latency can also be set per API mode (cache/live/auto), and chosen roster
+pages can fail outright or be missing from every mode but live.
+
+Run from the AI directory to serve it for a local bot:
+    python -m benchmarks.rsi_standin --port 8080 --pages 19 --latency 0.08
+and point the bot at it with the printed RSI_API_BASE_URL, RSI_STATUS_URL
+and RSI_INCIDENTS_FEED_URL settings in env/.env.
+"""
+import argparse
+import asyncio
+import copy
+import json
+import random
+import threading
+from collections import Counter
+from pathlib import Path
+import ssl
+from typing import Dict, Iterable, List, Optional
+
+from aiohttp import web
+
+from lib.constants import RSI_MEMBERS_PER_PAGE, RSI_ORGANIZATION_SID
+
+FIXTURES_DIR = Path(__file__).parent / 'fixtures'
+API_OUTAGE = {'success': 0, 'message': "Can't process the request.", 'data': None}
+
+def load_fixture(name: str):
+    path = FIXTURES_DIR / name
+    if path.suffix == '.json':
+        return json.loads(path.read_text(encoding='utf-8'))
+    return path.read_text(encoding='utf-8')
+
+class RSIStandIn:
+    """Local aiohttp server answering like the RSI API and status site"""
+
+    def __init__(self, pages: int = 19, members_per_page: int = RSI_MEMBERS_PER_PAGE,
+                 latency: float = 0.0, route_latency: Optional[Dict[str, float]] = None,
+                 mode_latency: Optional[Dict[str, float]] = None,
+                 error_rate: float = 0.0, route_error_rate: Optional[Dict[str, float]] = None,
+                 failing_pages: Iterable[int] = (), uncached_pages: Iterable[int] = (),
+                 seed: int = 0):
+        self.latency = latency
+        self.route_latency = route_latency or {}
+        self.mode_latency = mode_latency or {}
+        self.failing_pages = set(failing_pages)
+        self.uncached_pages = set(uncached_pages)
+        self.error_rate = error_rate
+        self.route_error_rate = route_error_rate or {}
+        self.random = random.Random(seed)
+        self.hits = Counter()
+        self.errors = Counter()
+        self.base_url: Optional[str] = None
+        self._runner: Optional[web.AppRunner] = None
+        self._thread_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+        recorded = load_fixture('organization_members.json')['data']
+        self.roster: List[Dict] = []
+        for n in range(pages * members_per_page - members_per_page // 2 if pages else 0):
+            member = copy.deepcopy(recorded[n % len(recorded)])
+            member.update(handle=f"Citizen_{n:04d}", display=f"Citizen {n:04d}")
+            self.roster.append(member)
+        self.members_per_page = members_per_page
+        self._by_handle = {member['handle'].casefold(): member for member in self.roster}
+        self._user = load_fixture('user.json')
+        self._status_html = load_fixture('status.html')
+        self._feed = load_fixture('index.xml')
+
+    @property
+    def roster_handles(self) -> List[str]:
+        return [member['handle'] for member in self.roster]
+
+    @property
+    def api_base_url(self) -> str:
+        return self.base_url
+
+    @property
+    def status_url(self) -> str:
+        return f"{self.base_url}/"
+
+    @property
+    def feed_url(self) -> str:
+        return f"{self.base_url}/index.xml"
+
+    async def _answer(self, route: str, mode: Optional[str] = None, fail: bool = False) -> bool:
+        """Count the hit, wait out the latency and decide whether it fails"""
+        self.hits[route] += 1
+        await asyncio.sleep(self.route_latency.get(route, self.mode_latency.get(mode, self.latency)))
+        if fail or self.random.random() < self.route_error_rate.get(route, self.error_rate):
+            self.errors[route] += 1
+            return False
+        return True
+
+    async def organization_members(self, request: web.Request) -> web.Response:
+        mode = request.match_info['mode']
+        page = max(1, int(request.query.get('page', 1)))
+        if not await self._answer('organization_members', mode, fail=page in self.failing_pages):
+            return web.json_response(API_OUTAGE)
+        if page in self.uncached_pages and mode != 'live':
+            return web.json_response({'success': 0, 'message': 'No cached data', 'data': None})
+        if request.match_info['sid'].upper() != RSI_ORGANIZATION_SID:
+            return web.json_response({'success': 1, 'message': 'ok', 'data': []})
+        start = (page - 1) * self.members_per_page
+        return web.json_response({'success': 1, 'message': 'ok', 'source': mode,
+                                  'data': self.roster[start:start + self.members_per_page]})
+
+    async def user(self, request: web.Request) -> web.Response:
+        if not await self._answer('user', request.match_info['mode']):
+            return web.json_response(API_OUTAGE)
+        handle = request.match_info['handle']
+        response = copy.deepcopy(self._user)
+        response['source'] = request.match_info['mode']
+        profile = response['data']['profile']
+        member = self._by_handle.get(handle.casefold())
+        profile['handle'] = member['handle'] if member else handle
+        profile['display'] = member['display'] if member else handle
+        if member:
+            response['data']['organization'] = {
+                'image': '', 'name': 'DraXon Industries', 'sid': RSI_ORGANIZATION_SID,
+                'rank': member['rank'], 'stars': member['stars']
+            }
+        return web.json_response(response)
+
+    async def status(self, request: web.Request) -> web.Response:
+        if not await self._answer('status'):
+            return web.Response(status=503, text='Service Unavailable')
+        return web.Response(text=self._status_html, content_type='text/html')
+
+    async def feed(self, request: web.Request) -> web.Response:
+        if not await self._answer('feed'):
+            return web.Response(status=503, text='Service Unavailable')
+        return web.Response(text=self._feed, content_type='application/rss+xml')
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get('/{key}/{version}/{mode}/organization_members/{sid}', self.organization_members)
+        app.router.add_get('/{key}/{version}/{mode}/user/{handle}', self.user)
+        app.router.add_get('/index.xml', self.feed)
+        app.router.add_get('/', self.status)
+        return app
+
+    async def start(self, host: str = 'localhost', port: int = 0,
+                    ssl_context: Optional[ssl.SSLContext] = None) -> str:
+        """Start serving, over TLS when given an ssl_context; returns the base URL"""
+        self._runner = web.AppRunner(self.app())
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port, ssl_context=ssl_context).start()
+        scheme = 'https' if ssl_context else 'http'
+        self.base_url = f"{scheme}://{host}:{self._runner.addresses[0][1]}"
+        return self.base_url
+
+    async def close(self):
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def start_in_thread(self, host: str = 'localhost', port: int = 0) -> str:
+        """Serve from a separate thread and event loop, so a client that blocks
+        its own loop (or measures loop stalls) does not also stall the server"""
+        started = threading.Event()
+        self._thread_loop = asyncio.new_event_loop()
+
+        def run():
+            asyncio.set_event_loop(self._thread_loop)
+            self._thread_loop.run_until_complete(self.start(host, port))
+            started.set()
+            self._thread_loop.run_forever()
+            self._thread_loop.run_until_complete(self.close())
+            self._thread_loop.close()
+
+        self._thread = threading.Thread(target=run, name='rsi-standin', daemon=True)
+        self._thread.start()
+        started.wait()
+        return self.base_url
+
+    def stop_thread(self):
+        if self._thread:
+            self._thread_loop.call_soon_threadsafe(self._thread_loop.stop)
+            self._thread.join()
+            self._thread = None
+
+async def serve(args: argparse.Namespace):
+    standin = RSIStandIn(pages=args.pages, latency=args.latency, error_rate=args.error_rate,
+                         route_latency={'status': args.status_latency, 'feed': args.status_latency}
+                         if args.status_latency is not None else None)
+    await standin.start(args.host, args.port)
+    print(f"RSI stand-in serving {len(standin.roster)} members on {standin.base_url}")
+    print(f"RSI_API_BASE_URL={standin.api_base_url}")
+    print(f"RSI_STATUS_URL={standin.status_url}")
+    print(f"RSI_INCIDENTS_FEED_URL={standin.feed_url}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await standin.close()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--pages', type=int, default=19, help='roster pages (last one half full)')
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every response')
+    parser.add_argument('--status-latency', type=float, default=None,
+                        help='seconds added to status page and feed responses instead')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of requests that fail')
+    try:
+        asyncio.run(serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
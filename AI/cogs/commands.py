@@ -168,11 +168,33 @@ class CommandsCog(commands.Cog):
             role_breakdown = "\n".join(f"└ {role}: {count}" 
                                      for role, count in role_counts.items())
 
+            api_line = ""
+            if self.bot.rsi_api:
+                api_stats = self.bot.rsi_api.stats()
+                waits = api_stats['wait']
+                api_line = (f"\n\n🛰️ **RSI API ({api_stats['health']['state'].replace('_', '-')}):** "
+                            f"{api_stats['requests']} requests, "
+                            f"{api_stats['coalesced']} merged, {api_stats['queue_depth']} queued\n"
+                            f"└ maintenance window: {api_stats['maintenance']['deferred_jobs']} jobs deferred, "
+                            f"{api_stats['maintenance']['avoided_calls']} calls avoided\n"
+                            + "\n".join(f"└ {name} wait p95: {wait['p95_ms']} ms"
+                                        for name, wait in waits.items() if wait['count']))
+
+            db_line = ""
+            if self.bot.rsi_db:
+                write_stats = self.bot.rsi_db.write_stats()
+                db_line = (f"\n\n🗄️ **RSI Database:** {write_stats['members_written']} member writes, "
+                           f"{write_stats['members_skipped']} unchanged skipped\n"
+                           f"└ {write_stats['writes']} writes in {write_stats['batches']} commits, "
+                           f"{write_stats['queue_depth']} queued")
+
             await interaction.response.send_message(
                 f"📊 **DraXon Member Statistics**\n\n"
                 f"👥 **Member Breakdown:**\n{role_breakdown}\n\n"
                 f"Total Human Members: {total_members}\n"
-                f"Total Automated Systems: {bot_count}",
+                f"Total Automated Systems: {bot_count}"
+                f"{api_line}"
+                f"{db_line}",
                 ephemeral=True
             )
         except Exception as e:
@@ -315,6 +337,8 @@ class CommandsCog(commands.Cog):
             # Leadership commands section
             leadership_commands = [
                 ("/draxon-stats", "Display detailed member statistics"),
+                ("/draxon-lookup", "Look up a linked member by RSI handle or name"),
+                ("/draxon-roster-changes", "Show org joins, leaves and rank changes"),
                 ("/promote", "Promote a member with role selection"),
                 ("/demote", "Demote a member with role selection")
             ]
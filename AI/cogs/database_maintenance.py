@@ -0,0 +1,79 @@
+from discord.ext import commands, tasks
+import logging
+from lib.constants import (
+    RSI_DB_RETENTION_INTERVAL,
+    RSI_DB_STATS_CHECK_INTERVAL,
+    RSI_DB_BACKUP_INTERVAL
+)
+
+logger = logging.getLogger('DraXon_AI')
+
+class DatabaseMaintenanceCog(commands.Cog):
+    """Background upkeep for the RSI member database"""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.last_retention = None
+        self.last_stats_check = None
+        self.last_backup = None
+        self.retention_task.start()
+        self.stats_check_task.start()
+        self.recode_task.start()
+        self.backup_task.start()
+
+    def cog_unload(self):
+        self.retention_task.cancel()
+        self.stats_check_task.cancel()
+        self.recode_task.cancel()
+        self.backup_task.cancel()
+
+    @tasks.loop(count=1)
+    async def recode_task(self):
+        """Move legacy JSON raw_data rows to the compressed codec once per start"""
+        try:
+            await self.bot.rsi_db.recode_raw_data()
+        except Exception as e:
+            logger.error(f"Error recoding raw_data: {e}")
+
+    @tasks.loop(hours=RSI_DB_RETENTION_INTERVAL)
+    async def retention_task(self):
+        """Trim expired role and verification history"""
+        try:
+            self.last_retention = await self.bot.rsi_db.run_retention()
+        except Exception as e:
+            logger.error(f"Error running history retention: {e}")
+
+    @tasks.loop(hours=RSI_DB_STATS_CHECK_INTERVAL)
+    async def stats_check_task(self):
+        """Reconcile the maintained stat counters with the real tables"""
+        try:
+            self.last_stats_check = await self.bot.rsi_db.verify_stats()
+        except Exception as e:
+            logger.error(f"Error verifying database stats: {e}")
+
+    @tasks.loop(hours=RSI_DB_BACKUP_INTERVAL)
+    async def backup_task(self):
+        """Write a rotated, compressed online snapshot of the member database"""
+        try:
+            self.last_backup = await self.bot.rsi_db.backup()
+        except Exception as e:
+            logger.error(f"Error backing up database: {e}")
+
+    @retention_task.before_loop
+    async def before_retention(self):
+        await self.bot.wait_until_ready()
+
+    @stats_check_task.before_loop
+    async def before_stats_check(self):
+        await self.bot.wait_until_ready()
+
+    @recode_task.before_loop
+    async def before_recode(self):
+        await self.bot.wait_until_ready()
+
+    @backup_task.before_loop
+    async def before_backup(self):
+        await self.bot.wait_until_ready()
+
+async def setup(bot):
+    await bot.add_cog(DatabaseMaintenanceCog(bot))
@@ -1,6 +1,7 @@
 import discord
 from discord.ext import commands, tasks
 import logging
+import asyncio
 import datetime
 from typing import List, Dict, Set
 from lib.constants import (
@@ -10,8 +11,10 @@ from lib.constants import (
     UNAFFILIATED_RANK,
     UNLINKED_REMINDER_MESSAGE,
     DEMOTION_MESSAGES,
-    DAILY_CHECK_TIME
+    DAILY_CHECK_TIME,
+    RSI_DEFERRED_SWEEP_INTERVAL
 )
+from lib.rsi_api import PRIORITY_BACKGROUND
 
 logger = logging.getLogger('DraXon_AI')
 
@@ -19,10 +22,14 @@ class MembershipMonitorCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.last_check = None
+        # Set when the role sweep was skipped because the RSI API was down
+        self.role_sweep_deferred = False
         self.daily_checks.start()
+        self.deferred_role_sweep.start()
 
     def cog_unload(self):
         self.daily_checks.cancel()
+        self.deferred_role_sweep.cancel()
 
     async def get_unlinked_members(self, guild: discord.Guild) -> List[discord.Member]:
         """Get list of members who haven't linked their RSI account"""
@@ -35,8 +42,8 @@ class MembershipMonitorCog(commands.Cog):
             if member.bot:
                 continue
             
-            member_data = rsi_cog.db.get_member_by_discord_id(str(member.id))
-            if not member_data:
+            member_row = await rsi_cog.db.get_member_row(str(member.id))
+            if not member_row:
                 unlinked_members.append(member)
 
         return unlinked_members
@@ -56,9 +63,14 @@ class MembershipMonitorCog(commands.Cog):
             logger.error("Required roles not found")
             return []
 
+        # Database writes are queued and committed together at the end of the sweep
+        pending_writes = []
+
         try:
             # Get current org members
-            org_members = await rsi_cog.get_org_members()
+            # Role enforcement never acts on a roster older than the cache TTL
+            roster = await rsi_cog.get_roster(allow_stale=False, priority=PRIORITY_BACKGROUND)
+            org_members = roster.members if roster else None
             if org_members is None:
                 logger.error("Failed to fetch organization members")
                 return []
@@ -70,15 +82,15 @@ class MembershipMonitorCog(commands.Cog):
                     continue
 
                 try:
-                    member_data = rsi_cog.db.get_member_by_discord_id(str(member.id))
+                    member_row = await rsi_cog.db.get_member_row(str(member.id))
                     current_roles = [role.name for role in member.roles]
                     current_rank = next((r for r in current_roles if r in ROLE_HIERARCHY), None)
                     
-                    if not member_data:
+                    if not member_row:
                         continue  # Skip unlinked members
                         
                     # Check if member is in org
-                    member_handle = member_data.get('handle', '').lower()
+                    member_handle = (member_row.handle or '').lower()
                     in_org = member_handle in org_handles
 
                     if not in_org:
@@ -98,10 +110,14 @@ class MembershipMonitorCog(commands.Cog):
                                 'new_rank': UNAFFILIATED_RANK,
                                 'reason': DEMOTION_MESSAGES['not_in_org']
                             })
+                            pending_writes.append(rsi_cog.db.log_role_change(
+                                str(member.id), current_rank or "None",
+                                UNAFFILIATED_RANK, DEMOTION_MESSAGES['not_in_org']
+                            ))
                         continue
 
                     # Get member's org status
-                    is_affiliate = member_data.get('org_status') == 'Affiliate'
+                    is_affiliate = member_row.org_status == 'Affiliate'
                     
                     # Check if affiliate needs demotion
                     if is_affiliate and current_rank:
@@ -125,8 +141,13 @@ class MembershipMonitorCog(commands.Cog):
                             })
 
                             # Update database
+                            member_data = dict(member_row.data)
                             member_data['org_rank'] = DEFAULT_DEMOTION_RANK
-                            await rsi_cog.db.store_member(str(member.id), member_data)
+                            pending_writes.append(rsi_cog.db.store_member(str(member.id), member_data))
+                            pending_writes.append(rsi_cog.db.log_role_change(
+                                str(member.id), current_rank,
+                                DEFAULT_DEMOTION_RANK, DEMOTION_MESSAGES['affiliate']
+                            ))
 
                 except Exception as e:
                     logger.error(f"Error processing member {member.name}: {e}")
@@ -135,6 +156,12 @@ class MembershipMonitorCog(commands.Cog):
         except Exception as e:
             logger.error(f"Error in check_member_roles: {e}")
 
+        if pending_writes:
+            results = await asyncio.gather(*pending_writes, return_exceptions=True)
+            failed = sum(1 for result in results if result is not True)
+            if failed:
+                logger.error(f"{failed} of {len(results)} role sweep database writes failed")
+
         return demotion_log
 
     async def send_demotion_notifications(self, guild: discord.Guild, demotions: List[Dict]):
@@ -221,6 +248,26 @@ class MembershipMonitorCog(commands.Cog):
         except Exception as e:
             logger.error(f"Error in send_unlinked_reminders: {e}")
 
+    async def run_role_sweep(self, guild: discord.Guild) -> bool:
+        """Enforce org-based roles in a guild and announce any demotions.
+
+        Returns False without touching roles when no fresh roster can be had,
+        deferring during the API maintenance window and failing fast while
+        the circuit is open.
+        """
+        rsi_cog = self.bot.get_cog('RSIIntegrationCog')
+        if not rsi_cog or self.bot.rsi_api.defer_for_maintenance("role sweep"):
+            return False
+        if not self.bot.rsi_api.available:
+            return False
+        # Loads the roster cache the sweep reads from, and doubles as a recovery probe
+        if not await rsi_cog.get_roster(allow_stale=False, priority=PRIORITY_BACKGROUND):
+            return False
+        demotions = await self.check_member_roles(guild)
+        logger.info(f"Found {len(demotions)} role updates needed")
+        await self.send_demotion_notifications(guild, demotions)
+        return True
+
     @tasks.loop(hours=24)
     async def daily_checks(self):
         """Run daily checks and notifications"""
@@ -238,12 +285,10 @@ class MembershipMonitorCog(commands.Cog):
             try:
                 logger.info(f"Running checks for guild: {guild.name}")
                 
-                # Perform role checks and get demotion log
-                demotions = await self.check_member_roles(guild)
-                logger.info(f"Found {len(demotions)} role updates needed")
-                
-                # Send demotion notifications if any occurred
-                await self.send_demotion_notifications(guild, demotions)
+                # Role checks need a live roster; with the API down they wait for recovery
+                if not await self.run_role_sweep(guild):
+                    self.role_sweep_deferred = True
+                    logger.warning(f"No fresh org roster, deferring role sweep for {guild.name}")
                 
                 # Send reminders to unlinked members
                 await self.send_unlinked_reminders(guild)
@@ -253,9 +298,27 @@ class MembershipMonitorCog(commands.Cog):
             except Exception as e:
                 logger.error(f"Error in daily checks for guild {guild.name}: {e}")
 
+    @tasks.loop(minutes=RSI_DEFERRED_SWEEP_INTERVAL)
+    async def deferred_role_sweep(self):
+        """Run a role sweep that was deferred once the RSI API is reachable again"""
+        if not self.role_sweep_deferred or not self.bot.rsi_api.accepts(PRIORITY_BACKGROUND):
+            return
+        self.role_sweep_deferred = False
+        for guild in self.bot.guilds:
+            try:
+                logger.info(f"Running deferred role sweep for guild: {guild.name}")
+                if not await self.run_role_sweep(guild):
+                    self.role_sweep_deferred = True
+            except Exception as e:
+                logger.error(f"Error in deferred role sweep for guild {guild.name}: {e}")
+
     @daily_checks.before_loop
     async def before_daily_checks(self):
         await self.bot.wait_until_ready()
+
+    @deferred_role_sweep.before_loop
+    async def before_deferred_role_sweep(self):
+        await self.bot.wait_until_ready()
         
 async def setup(bot):
     await bot.add_cog(MembershipMonitorCog(bot))
\ No newline at end of file
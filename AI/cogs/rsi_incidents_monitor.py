@@ -2,7 +2,7 @@ import discord
 from discord.ext import commands, tasks
 import logging
 import feedparser
-import requests
+import aiohttp
 import asyncio
 from datetime import datetime
 from typing import Optional, Dict, Any
@@ -14,25 +14,24 @@ logger = logging.getLogger('DraXon_AI')
 class RSIIncidentMonitorCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.session = bot.session
         self.max_retries = 3
-        self.timeout = 10
-        self.feed_url = "https://status.robertsspaceindustries.com/index.xml"
+        self.feed_url = bot.rsi_incidents_feed_url
         self.last_incident_guid = None
         self.check_incidents_task.start()
 
     def cog_unload(self):
         self.check_incidents_task.cancel()
 
-    async def make_request(self) -> Optional[requests.Response]:
-        """Make HTTP request with retries and timeout"""
+    async def make_request(self) -> Optional[str]:
+        """Fetch the RSI incident feed with retries; the body, or None if every attempt failed"""
         for attempt in range(self.max_retries):
             try:
-                response = self.session.get(self.feed_url, timeout=self.timeout)
-                response.raise_for_status()
-                return response
-            except requests.RequestException as e:
-                logger.warning(f"Request attempt {attempt + 1} failed: {e}")
+                # The shared session applies the total and connect timeouts without blocking the loop
+                async with self.bot.http_session.get(self.feed_url) as response:
+                    response.raise_for_status()
+                    return await response.text()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.warning(f"Request attempt {attempt + 1} failed: {str(e) or type(e).__name__}")
                 if attempt == self.max_retries - 1:
                     logger.error(f"All retry attempts failed for {self.feed_url}")
                     return None
@@ -43,11 +42,11 @@ class RSIIncidentMonitorCog(commands.Cog):
         """Check RSS feed for new incidents"""
         logger.info("Checking RSS feed for new incidents...")
         try:
-            response = await self.make_request()
-            if not response:
+            feed_text = await self.make_request()
+            if not feed_text:
                 return None
 
-            feed = feedparser.parse(response.text)
+            feed = feedparser.parse(feed_text)
             if not feed.entries:
                 return None
                 
@@ -1,76 +1,360 @@
 import discord
 from discord import app_commands
-from discord.ext import commands
+from discord.ext import commands, tasks
 import logging
-import aiohttp
+import asyncio
 import json
 import io
 import os
 import datetime
-from typing import Dict, List, Optional
+from urllib.parse import quote
+from typing import Dict, List, Optional, Tuple
 from lib.constants import (
-    RSI_API_BASE_URL,
-    RSI_API_VERSION,
     RSI_API_MODE,
+    RSI_API_BULK_MODE,
     RSI_ORGANIZATION_SID,
     COMPARE_STATUS,
     RSI_MEMBERS_PER_PAGE,
-    DB_DIR,
-    RSI_DB_PATH,
+    RSI_ORG_FETCH_CONCURRENCY,
+    MAX_RETRIES,
+    RSI_PENDING_LINK_INTERVAL,
+    RSI_PENDING_LINK_MAX_AGE,
+    RSI_MEMBER_REFRESH_INTERVAL,
+    RSI_MEMBER_REFRESH_CONCURRENCY,
+    RSI_MEMBER_REFRESH_FALLBACK_LIMIT,
     API_MAINTENANCE_START,
-    API_MAINTENANCE_DURATION
+    API_MAINTENANCE_DURATION,
+    DraXon_ROLES
+)
+from lib.member_cache import MemberCache
+from lib.roster_cache import RosterCache, CachedRoster
+from lib.profile_cache import ProfileCache
+from lib.roster_snapshots import index_roster
+from lib.rsi_api import (
+    PRIORITY_INTERACTIVE,
+    PRIORITY_COMMAND,
+    PRIORITY_BACKGROUND,
+    api_unavailable,
+    has_data
 )
-from lib.rsi_db import RSIDatabase
 
 logger = logging.getLogger('DraXon_AI')
 
+def find_org_membership(data: Dict) -> Optional[Tuple[str, Dict]]:
+    """Find DraXon in a user/{handle} payload as ('Main' or 'Affiliate', org data)"""
+    main_org = data.get('organization') or {}
+    if main_org.get('sid') == RSI_ORGANIZATION_SID:
+        return 'Main', main_org
+    for org in data.get('affiliation') or []:
+        if org.get('sid') == RSI_ORGANIZATION_SID:
+            return 'Affiliate', org
+    return None
+
 class RSIIntegrationCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.api_key = os.getenv('RSI_API_KEY')
-        # Initialize database
-        DB_DIR.mkdir(exist_ok=True)
-        self.db = RSIDatabase(RSI_DB_PATH)
+        # Database is owned by the bot so it outlives cog reloads
+        self.db = bot.rsi_db
+        # Every roster consumer shares this cache, seeded from the last recorded snapshot
+        self.roster_cache = RosterCache(self.get_org_members, load_last_known=self.db.get_latest_roster)
+        self.profile_cache = ProfileCache()
         if not self.api_key:
             logger.error("RSI API key not found in environment variables")
+        # (finished at, counts) of the last linked member refresh
+        self.last_member_refresh: Optional[Tuple[datetime.datetime, Dict[str, int]]] = None
+        self.process_pending_links.start()
+        self.refresh_linked_members_task.start()
+
+    def cog_unload(self):
+        self.process_pending_links.cancel()
+        self.refresh_linked_members_task.cancel()
+
+    async def fetch_api_data(self, endpoint: str, params: Dict = None,
+                             priority: int = PRIORITY_COMMAND, mode: str = RSI_API_MODE) -> Dict:
+        """Generic method to fetch data from RSI API through the bot's rate-limited client"""
+        return await self.bot.rsi_api.get(endpoint, params=params, priority=priority, mode=mode)
+
+    async def get_user_info(self, handle: str, fresh: bool = False,
+                            priority: int = PRIORITY_INTERACTIVE, mode: str = RSI_API_MODE) -> Dict:
+        """Fetch user information from RSI API, cached per handle unless fresh is set"""
+        if not fresh:
+            hit, response = self.profile_cache.get(handle)
+            if hit:
+                return response
+        # Handles are user-typed; quoting keeps '/', '?' or '#' from reshaping the URL
+        response = await self.fetch_api_data(f"user/{quote(handle, safe='')}", priority=priority, mode=mode)
+        # Only live answers are cached, so verification never reuses the API's cached data.
+        # Profiles outside DraXon are not cached either: a user who just joined and
+        # retries /draxon-link must be re-checked, not told they are not a member.
+        outside_org = has_data(response) and not find_org_membership(response['data'])
+        if mode == RSI_API_MODE and not outside_org:
+            self.profile_cache.put(handle, response)
+        return response
+
+    async def link_member(self, discord_id: str, handle: str,
+                          priority: int = PRIORITY_INTERACTIVE) -> Tuple[Optional[bool], str]:
+        """Verify an RSI handle and link it to a Discord member.
+
+        Returns (True, message) when linked, (False, message) when rejected
+        and (None, message) when the API was unavailable and it may be retried.
+        """
+        logger.info(f"Searching for RSI Handle: {handle}")
+
+        response = await self.get_user_info(handle, priority=priority)
+        logger.info(f"Full API Response: {json.dumps(response, indent=2)}")
+
+        # No response covers both an API outage and an open circuit
+        if api_unavailable(response):
+            return None, (
+                "⚠️ **RSI API is Currently Unavailable**\n\n"
+                "The RSI API is experiencing downtime. This is a known issue that occurs daily "
+                f"from {API_MAINTENANCE_START} UTC for approximately {API_MAINTENANCE_DURATION} hours.\n\n"
+                "Please try again later when the API service has been restored."
+            )
 
-    async def fetch_api_data(self, endpoint: str, params: Dict = None) -> Dict:
-        """Generic method to fetch data from RSI API"""
-        url = f"{RSI_API_BASE_URL}/{self.api_key}/{RSI_API_VERSION}/{RSI_API_MODE}/{endpoint}"
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params) as response:
-                    if response.status == 200:
-                        return await response.json()
-                    else:
-                        logger.error(f"API request failed: {response.status}")
-                        return None
-        except Exception as e:
-            logger.error(f"Error fetching API data: {e}")
-            return None
+        if not response.get('success'):
+            return False, "❌ Invalid RSI Handle. Please check your handle and try again."
 
-    async def get_user_info(self, handle: str) -> Dict:
-        """Fetch user information from RSI API"""
-        return await self.fetch_api_data(f"user/{handle}")
+        try:
+            data = response.get('data', {})
+            profile = data.get('profile', {})
+
+            if not profile:
+                return False, "❌ Could not retrieve profile information."
+
+            # Check DraXon membership
+            membership = find_org_membership(data)
+            if not membership:
+                return False, (
+                    "⚠️ Your RSI Handle was found, but you don't appear to be a member of our organization. " +
+                    "Please join our organization first and try again."
+                )
+            org_status, draxon_org = membership
+
+            # Prepare data for storage
+            rsi_data = {
+                'discord_id': discord_id,
+                'sid': profile.get('id', '').replace('#', ''),
+                'handle': profile.get('handle', handle),
+                'display': profile.get('display', handle),
+                'verified': True,
+                'enlisted': profile.get('enlisted', ''),
+                'org_sid': draxon_org.get('sid', ''),
+                'org_name': draxon_org.get('name', ''),
+                'org_rank': draxon_org.get('rank', ''),
+                'org_stars': draxon_org.get('stars', 0),
+                'org_status': org_status,
+                'last_updated': datetime.datetime.utcnow().isoformat(),
+                'raw_profile': profile,
+                'raw_org': draxon_org
+            }
+
+            # Store in database
+            success = await self.db.store_member(discord_id, rsi_data)
+            if not success:
+                return False, "❌ Failed to store RSI account information."
+
+            response_msg = [
+                "✅ RSI Account Successfully Linked!",
+                "",
+                "**Account Information:**",
+                f"🔹 Handle: {rsi_data['handle']}",
+                f"🔹 Display Name: {rsi_data['display']}",
+                f"🔹 Citizen ID: {rsi_data['sid']}",
+                f"🔹 Enlisted: {rsi_data['enlisted'][:10]}",
+                "",
+                "**Organization Status:**",
+                f"🔹 Organization: {rsi_data['org_name']}",
+                f"🔹 Status: {rsi_data['org_status']}",
+                f"🔹 Rank: {rsi_data['org_rank']}",
+                f"🔹 Stars: {'⭐' * rsi_data['org_stars']}"
+            ]
+            return True, "\n".join(response_msg)
 
-    async def get_org_members(self) -> List[Dict]:
-        """Fetch all organization members from RSI API"""
-        members = []
-        page = 1
+        except Exception as e:
+            logger.error(f"Error processing API response: {str(e)}")
+            return False, "❌ Error processing RSI account information. Please try again."
+
+    async def fetch_roster_page(self, page: int, priority: int = PRIORITY_COMMAND) -> Optional[List[Dict]]:
+        """Fetch one page of the org roster, retrying; None if it could not be fetched"""
+        for attempt in range(1, MAX_RETRIES + 1):
+            data = await self.fetch_api_data(f"organization_members/{RSI_ORGANIZATION_SID}",
+                                             params={"page": page}, priority=priority,
+                                             mode=RSI_API_BULK_MODE)
+            # An unavailable API answers with success unset and no data
+            if data is not None and (data.get('success', True) or data.get('data') is not None):
+                return data.get('data') or []
+            logger.warning(f"Roster page {page} failed (attempt {attempt}/{MAX_RETRIES})")
+            # Retrying into an open circuit or the maintenance window only wastes calls
+            if not self.bot.rsi_api.accepts(priority):
+                break
+        return None
+
+    async def fetch_org_roster(self, priority: int = PRIORITY_COMMAND) -> Tuple[List[Dict], List[int]]:
+        """Fetch roster pages concurrently; returns (members in page order, failed pages).
+
+        The page count is unknown up front, so up to RSI_ORG_FETCH_CONCURRENCY
+        pages are fetched ahead until a short page marks the end. Members seen
+        on two pages (the roster shifting mid-fetch) are kept once.
+        """
+        pages: Dict[int, Optional[List[Dict]]] = {}
+        in_flight: Dict[asyncio.Task, int] = {}
+        last_page = None
+        next_page = 1
         try:
             while True:
-                data = await self.fetch_api_data(f"organization_members/{RSI_ORGANIZATION_SID}", 
-                                               params={"page": page})
-                if not data or not data.get('data'):
+                failed = any(data is None for data in pages.values())
+                while (len(in_flight) < RSI_ORG_FETCH_CONCURRENCY and not failed
+                       and (last_page is None or next_page <= last_page)):
+                    in_flight[asyncio.create_task(self.fetch_roster_page(next_page, priority))] = next_page
+                    next_page += 1
+                if not in_flight:
                     break
-                members.extend(data['data'])
-                if len(data['data']) < RSI_MEMBERS_PER_PAGE:
-                    break
-                page += 1
+
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    page = in_flight.pop(task)
+                    pages[page] = task.result()
+                    if pages[page] is not None and len(pages[page]) < RSI_MEMBERS_PER_PAGE:
+                        last_page = page if last_page is None else min(last_page, page)
+
+                # Pages past the end are empty; stop waiting on them
+                for task, page in list(in_flight.items()):
+                    if last_page is not None and page > last_page:
+                        task.cancel()
+                        del in_flight[task]
+        finally:
+            for task in in_flight:
+                task.cancel()
+
+        final_page = last_page or max(pages, default=0)
+        members, failed_pages, seen = [], [], set()
+        for page in range(1, final_page + 1):
+            data = pages.get(page)
+            if data is None:
+                failed_pages.append(page)
+                continue
+            for member in data:
+                key = MemberCache.handle_key(member.get('handle'))
+                if key not in seen:
+                    seen.add(key)
+                    members.append(member)
+        return members, failed_pages
+
+    async def get_org_members(self, priority: int = PRIORITY_COMMAND) -> Optional[List[Dict]]:
+        """Fetch all organization members from RSI API; None unless every page arrived"""
+        if priority == PRIORITY_BACKGROUND and self.bot.rsi_api.defer_for_maintenance("roster refresh"):
+            return None
+        try:
+            members, failed_pages = await self.fetch_org_roster(priority)
+            if failed_pages:
+                # A truncated roster would read as members leaving the org
+                logger.error(f"Org roster incomplete, failed pages: {failed_pages} "
+                             f"({len(members)} members fetched)")
+                return None
+            if members:
+                self.db.store_roster(members)
             return members
         except Exception as e:
             logger.error(f"Error fetching org members: {e}")
-            return []
+            return None
+
+    async def get_roster(self, allow_stale: bool = True,
+                         priority: int = PRIORITY_COMMAND) -> Optional[CachedRoster]:
+        """Get the org roster through the shared cache, marked with its age"""
+        return await self.roster_cache.get(allow_stale=allow_stale, priority=priority)
+
+    def roster_failure_message(self) -> str:
+        """Explain a missing roster, distinguishing an API outage from other failures"""
+        if not self.bot.rsi_api.available:
+            return (f"⚠️ RSI API is currently unavailable. "
+                    f"Retrying in about {int(self.bot.rsi_api.breaker.retry_in())}s.")
+        return "❌ Failed to fetch organization members."
+
+    async def refresh_linked_members(self) -> Optional[Dict[str, int]]:
+        """Refresh linked members' org fields from one roster fetch; None if it could not run.
+
+        Linked rows are hash-joined to the roster on the casefolded handle.
+        Only members the roster cannot resolve (listed without a known
+        main/affiliate status, or missing though not yet recorded as gone)
+        fall back to user/{handle} lookups, oldest first, with bounded
+        concurrency and a per-run cap.
+        """
+        if self.bot.rsi_api.defer_for_maintenance("linked member refresh"):
+            return None
+        cached = await self.get_roster(allow_stale=False, priority=PRIORITY_BACKGROUND)
+        if not cached:
+            logger.warning("Linked member refresh skipped: org roster unavailable")
+            return None
+
+        roster = index_roster(cached.members)
+        now = datetime.datetime.utcnow().isoformat()
+        stats = {'linked': 0, 'matched': 0, 'updated': 0, 'failed': 0, 'looked_up': 0, 'left': 0, 'unresolved': 0}
+        writes, unresolved = [], []
+
+        async for row in self.db.iter_member_rows():
+            stats['linked'] += 1
+            member = roster.get(MemberCache.handle_key(row.handle))
+            if member is None:
+                # Members already recorded as gone are picked up again when they rejoin
+                if row.org_status is not None:
+                    unresolved.append(row)
+                continue
+            # Roster entries don't say main or affiliate, so that has to come from the profile
+            if row.org_status not in ('Main', 'Affiliate'):
+                unresolved.append(row)
+                continue
+            stats['matched'] += 1
+            fields = {
+                'handle': member.get('handle') or row.handle,
+                'display': member.get('display') or row.display_name,
+                'org_rank': member.get('rank', ''),
+                'org_stars': member.get('stars', 0)
+            }
+            current = {'handle': row.handle, 'display': row.display_name,
+                       'org_rank': row.org_rank, 'org_stars': row.org_stars}
+            if fields != current:
+                writes.append(self.db.store_member(row.discord_id, dict(row.data, **fields, last_updated=now)))
+
+        unresolved.sort(key=lambda row: row.last_updated or '')
+        lookups = unresolved[:RSI_MEMBER_REFRESH_FALLBACK_LIMIT]
+        stats['unresolved'] = len(unresolved) - len(lookups)
+        semaphore = asyncio.Semaphore(RSI_MEMBER_REFRESH_CONCURRENCY)
+
+        async def look_up(row):
+            async with semaphore:
+                # Once the API stops accepting background work the rest wait for the next run
+                if not self.bot.rsi_api.accepts(PRIORITY_BACKGROUND):
+                    stats['unresolved'] += 1
+                    return
+                response = await self.get_user_info(row.handle, priority=PRIORITY_BACKGROUND,
+                                                    mode=RSI_API_BULK_MODE)
+            stats['looked_up'] += 1
+            if api_unavailable(response) or not response.get('success'):
+                stats['unresolved'] += 1
+                return
+            membership = find_org_membership(response.get('data') or {})
+            if membership:
+                org_status, org = membership
+                fields = {'org_status': org_status, 'org_sid': org.get('sid', ''),
+                          'org_name': org.get('name', ''), 'org_rank': org.get('rank', ''),
+                          'org_stars': org.get('stars', 0), 'raw_org': org}
+            else:
+                stats['left'] += 1
+                fields = {'org_status': None, 'org_rank': None, 'org_stars': 0}
+            writes.append(self.db.store_member(row.discord_id, dict(row.data, **fields, last_updated=now)))
+
+        await asyncio.gather(*(look_up(row) for row in lookups))
+
+        if writes:
+            results = await asyncio.gather(*writes, return_exceptions=True)
+            stats['updated'] = sum(1 for result in results if result is True)
+            stats['failed'] = len(results) - stats['updated']
+            if stats['failed']:
+                logger.error(f"{stats['failed']} of {len(results)} linked member refresh writes failed")
+        logger.info(f"Linked member refresh: {stats}")
+        return stats
 
     async def create_member_table(self, members: List[Dict], include_roles: bool = True) -> str:
         """Create a formatted table of members"""
@@ -84,20 +368,19 @@ class RSIIntegrationCog(commands.Cog):
 
         for member in sorted_members:
             # Try to get Discord info from database
-            discord_info = self.db.search_members({"handle": member['handle']})
+            member_row = await self.db.get_member_row_by_handle(member['handle'])
             discord_member = None
             
-            if discord_info:
-                member_data = discord_info[0]
+            if member_row:
                 for guild in self.bot.guilds:
-                    discord_member = guild.get_member(int(member_data.get('discord_id')))
+                    discord_member = guild.get_member(int(member_row.discord_id))
                     if discord_member:
                         break
 
             discord_id = discord_member.id if discord_member else "N/A"
             discord_name = discord_member.name if discord_member else "N/A"
             roles_str = ", ".join(member.get('roles', [])) if include_roles else ""
-            org_status = member_data.get('org_status', 'Unknown') if discord_info else 'Unknown'
+            org_status = (member_row.org_status or 'Unknown') if member_row else 'Unknown'
             
             row = (f"{discord_id} | {discord_name} | {member['display']} | "
                   f"{member['handle']} | {member.get('stars', 0)} | {org_status} | "
@@ -122,17 +405,17 @@ class RSIIntegrationCog(commands.Cog):
                 continue
                 
             # Get member data from database
-            member_data = self.db.get_member_by_discord_id(str(member.id))
+            member_row = await self.db.get_member_row(str(member.id))
             
-            if member_data:
-                handle = member_data.get('handle')
+            if member_row:
+                handle = member_row.handle
                 org_member = org_by_handle.get(handle)
                 
                 status = COMPARE_STATUS['match'] if org_member else COMPARE_STATUS['missing']
-                display = org_member['display'] if org_member else member_data.get('display', 'N/A')
+                display = org_member['display'] if org_member else (member_row.display_name or 'N/A')
                 stars = str(org_member.get('stars', 'N/A')) if org_member else 'N/A'
-                org_status = member_data.get('org_status', 'N/A')
-                last_updated = member_data.get('last_updated', 'Never')[:16].replace('T', ' ')
+                org_status = member_row.org_status or 'N/A'
+                last_updated = (member_row.last_updated or 'Never')[:16].replace('T', ' ')
             else:
                 status = COMPARE_STATUS['missing']
                 handle = 'N/A'
@@ -160,9 +443,10 @@ class RSIIntegrationCog(commands.Cog):
         await interaction.response.defer()
 
         try:
-            members = await self.get_org_members()
+            roster = await self.get_roster()
+            members = roster.members if roster else None
             if not members:
-                await interaction.followup.send("❌ Failed to fetch organization members.")
+                await interaction.followup.send(self.roster_failure_message())
                 return
 
             table = await self.create_member_table(members)
@@ -173,7 +457,8 @@ class RSIIntegrationCog(commands.Cog):
             )
 
             await interaction.followup.send(
-                "Organization Members List (attached as file)",
+                "Organization Members List (attached as file)\n"
+                f"*Roster data {roster.age_text()}*",
                 file=file
             )
 
@@ -188,9 +473,10 @@ class RSIIntegrationCog(commands.Cog):
         await interaction.response.defer()
 
         try:
-            org_members = await self.get_org_members()
+            roster = await self.get_roster()
+            org_members = roster.members if roster else None
             if not org_members:
-                await interaction.followup.send("❌ Failed to fetch organization members.")
+                await interaction.followup.send(self.roster_failure_message())
                 return
 
             guild_members = interaction.guild.members
@@ -202,7 +488,8 @@ class RSIIntegrationCog(commands.Cog):
             )
 
             await interaction.followup.send(
-                "Member Comparison (attached as file)",
+                "Member Comparison (attached as file)\n"
+                f"*Roster data {roster.age_text()}*",
                 file=file
             )
 
@@ -210,6 +497,166 @@ class RSIIntegrationCog(commands.Cog):
             logger.error(f"Error in compare_members command: {e}")
             await interaction.followup.send("❌ An error occurred while comparing members.")
 
+    async def member_autocomplete(self, interaction: discord.Interaction,
+                                  current: str) -> List[app_commands.Choice[str]]:
+        """Suggest linked members by RSI handle or display name"""
+        user_roles = [role.name for role in getattr(interaction.user, 'roles', [])]
+        if not any(role in DraXon_ROLES['leadership'] for role in user_roles):
+            return []
+        try:
+            rows = await self.db.lookup_members(current, limit=25)
+            return [
+                app_commands.Choice(
+                    name=f"{row.handle} ({row.display_name or 'N/A'})"[:100],
+                    value=row.discord_id
+                ) for row in rows
+            ]
+        except Exception as e:
+            logger.error(f"Error in member autocomplete: {e}")
+            return []
+
+    @app_commands.command(name="draxon-lookup", description="Look up a linked member by RSI handle or name")
+    @app_commands.describe(member="RSI handle or display name")
+    @app_commands.autocomplete(member=member_autocomplete)
+    @app_commands.checks.has_any_role("Chairman", "Director")
+    async def lookup_member(self, interaction: discord.Interaction, member: str):
+        """Command to show a linked member's RSI details"""
+        try:
+            # Autocomplete supplies a Discord ID; typed text falls back to a handle lookup
+            row = await self.db.get_member_row(member) or await self.db.get_member_row_by_handle(member)
+            if not row:
+                await interaction.response.send_message(
+                    f"❌ No linked member found for `{member}`.",
+                    ephemeral=True
+                )
+                return
+
+            embed = discord.Embed(
+                title=f"🔎 {row.handle}",
+                description=f"Linked to <@{row.discord_id}>",
+                color=discord.Color.blue()
+            )
+            embed.add_field(name="Display Name", value=row.display_name or "N/A", inline=True)
+            embed.add_field(name="Citizen ID", value=row.sid or "N/A", inline=True)
+            embed.add_field(name="Org Status", value=row.org_status or "Unknown", inline=True)
+            embed.add_field(name="Org Rank", value=row.org_rank or "Unknown", inline=True)
+            embed.add_field(name="Stars", value='⭐' * row.org_stars or "0", inline=True)
+            embed.add_field(
+                name="Last Updated",
+                value=(row.last_updated or 'Never')[:16].replace('T', ' '),
+                inline=True
+            )
+
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+
+        except Exception as e:
+            logger.error(f"Error in lookup_member command: {e}")
+            await interaction.response.send_message(
+                "❌ An error occurred while looking up the member.",
+                ephemeral=True
+            )
+
+    @app_commands.command(name="draxon-roster-changes", description="Show org joins, leaves and rank changes")
+    @app_commands.describe(days="How many days back to look (default 30)")
+    @app_commands.checks.has_any_role("Chairman", "Director")
+    async def roster_changes(self, interaction: discord.Interaction, days: app_commands.Range[int, 1, 365] = 30):
+        """Command to summarize recorded roster history"""
+        try:
+            since = (datetime.datetime.utcnow() - datetime.timedelta(days=days)).isoformat()
+            events = await self.db.get_roster_events(since=since)
+            latest = await self.db.get_latest_roster()
+            if not latest:
+                await interaction.response.send_message(
+                    "❌ No roster snapshots have been recorded yet.",
+                    ephemeral=True
+                )
+                return
+
+            sections = {'joined': [], 'left': [], 'changed': []}
+            for event in events:
+                when = event['timestamp'][:10]
+                if event['event'] == 'changed':
+                    changes = ", ".join(
+                        f"{field} {old} → {new}" for field, (old, new) in event['details'].items()
+                        if field in ('rank', 'stars', 'roles')
+                    )
+                    if not changes:
+                        continue
+                    sections['changed'].append(f"`{when}` {event['handle']}: {changes}")
+                else:
+                    sections[event['event']].append(f"`{when}` {event['handle']}")
+
+            embed = discord.Embed(
+                title=f"📋 Roster Changes (last {days} days)",
+                description=(f"{latest['member_count']} members as of "
+                             f"{latest['confirmed_at'][:16].replace('T', ' ')} UTC"),
+                color=discord.Color.blue()
+            )
+            for key, title in (('joined', "Joined"), ('left', "Left"), ('changed', "Rank Changes")):
+                lines = sections[key]
+                value = "\n".join(lines[-15:]) if lines else "None"
+                if len(lines) > 15:
+                    value = f"...and {len(lines) - 15} earlier\n" + value
+                embed.add_field(name=f"{title} ({len(lines)})", value=value[-1024:], inline=False)
+
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+
+        except Exception as e:
+            logger.error(f"Error in roster_changes command: {e}")
+            await interaction.response.send_message(
+                "❌ An error occurred while reading roster history.",
+                ephemeral=True
+            )
+
+    @tasks.loop(minutes=RSI_PENDING_LINK_INTERVAL)
+    async def process_pending_links(self):
+        """Link accounts queued during the maintenance window once the API is back"""
+        if not self.bot.rsi_api or not self.bot.rsi_api.accepts(PRIORITY_BACKGROUND):
+            return
+        expires = (datetime.datetime.utcnow() - datetime.timedelta(hours=RSI_PENDING_LINK_MAX_AGE)).isoformat()
+        for pending in await self.db.get_pending_links():
+            try:
+                linked, message = await self.link_member(pending['discord_id'], pending['handle'],
+                                                         priority=PRIORITY_COMMAND)
+                if linked is None:
+                    if not self.bot.rsi_api.accepts(PRIORITY_BACKGROUND):
+                        break  # API unavailable again; keep the rest queued for the next run
+                    # This request alone failed; retry it next run unless it has been failing too long
+                    if pending['requested_at'] > expires:
+                        continue
+                    logger.warning(f"Dropping queued link for {pending['discord_id']} "
+                                   f"after {RSI_PENDING_LINK_MAX_AGE}h of failures")
+                    message = ("❌ Your RSI account could not be verified. "
+                               "Please check your handle and run `/draxon-link` again.")
+                await self.db.remove_pending_link(pending['discord_id'], pending['handle'])
+
+                user = self.bot.get_user(int(pending['discord_id']))
+                if user:
+                    await user.send(f"Your queued RSI account link for **{pending['handle']}** "
+                                    f"has been processed:\n\n{message}")
+            except discord.Forbidden:
+                logger.warning(f"Could not DM link result to {pending['discord_id']}")
+            except Exception as e:
+                logger.error(f"Error processing queued link for {pending['discord_id']}: {e}")
+
+    @process_pending_links.before_loop
+    async def before_process_pending_links(self):
+        await self.bot.wait_until_ready()
+
+    @tasks.loop(hours=RSI_MEMBER_REFRESH_INTERVAL)
+    async def refresh_linked_members_task(self):
+        """Keep linked members' org status, rank and stars in step with the roster"""
+        try:
+            stats = await self.refresh_linked_members()
+            if stats is not None:
+                self.last_member_refresh = (datetime.datetime.utcnow(), stats)
+        except Exception as e:
+            logger.error(f"Error refreshing linked members: {e}")
+
+    @refresh_linked_members_task.before_loop
+    async def before_refresh_linked_members(self):
+        await self.bot.wait_until_ready()
+
 class LinkAccountModal(discord.ui.Modal, title='Link RSI Account'):
     def __init__(self):
         super().__init__()
@@ -226,113 +673,21 @@ class LinkAccountModal(discord.ui.Modal, title='Link RSI Account'):
         await interaction.response.defer(ephemeral=True)
         
         try:
-            logger.info(f"Searching for RSI Handle: {self.handle.value}")
-            
-            response = await self.cog.get_user_info(self.handle.value)
-            logger.info(f"Full API Response: {json.dumps(response, indent=2)}")
-
-            # Check for API unavailability response
-            if response and not response.get('success') and response.get('message') == "Can't process the request." and response.get('data') is None:
+            # The API is down for maintenance; hold the request instead of failing it
+            ends_at = self.cog.bot.rsi_api.defer_for_maintenance("link request")
+            if ends_at:
+                await self.cog.db.queue_link(str(interaction.user.id), self.handle.value)
                 await interaction.followup.send(
-                    "⚠️ **RSI API is Currently Unavailable**\n\n"
-                    "The RSI API is experiencing downtime. This is a known issue that occurs daily "
-                    f"from {API_MAINTENANCE_START} UTC for approximately {API_MAINTENANCE_DURATION} hours.\n\n"
-                    "Please try again later when the API service has been restored.",
+                    "⏳ **RSI API Maintenance**\n\n"
+                    f"The RSI API is in its daily maintenance window until about {ends_at:%H:%M} UTC. "
+                    f"Your link request for **{self.handle.value}** has been queued and will be "
+                    "processed automatically afterwards; you'll get a DM with the result.",
                     ephemeral=True
                 )
                 return
 
-            if not response or not response.get('success'):
-                await interaction.followup.send(
-                    "❌ Invalid RSI Handle. Please check your handle and try again.",
-                    ephemeral=True
-                )
-                return
-
-            try:
-                data = response.get('data', {})
-                profile = data.get('profile', {})
-                main_org = data.get('organization', {})
-                affiliations = data.get('affiliation', [])
-
-                if not profile:
-                    await interaction.followup.send(
-                        "❌ Could not retrieve profile information.",
-                        ephemeral=True
-                    )
-                    return
-
-                # Check DraXon membership
-                is_main_org = main_org.get('sid') == RSI_ORGANIZATION_SID
-                is_affiliate = any(org.get('sid') == RSI_ORGANIZATION_SID for org in affiliations)
-
-                if not is_main_org and not is_affiliate:
-                    await interaction.followup.send(
-                        "⚠️ Your RSI Handle was found, but you don't appear to be a member of our organization. " +
-                        "Please join our organization first and try again.",
-                        ephemeral=True
-                    )
-                    return
-
-                # Get DraXon org data
-                draxon_org = main_org if is_main_org else next(
-                    org for org in affiliations if org.get('sid') == RSI_ORGANIZATION_SID
-                )
-
-                # Prepare data for storage
-                rsi_data = {
-                    'discord_id': str(interaction.user.id),
-                    'sid': profile.get('id', '').replace('#', ''),
-                    'handle': profile.get('handle', self.handle.value),
-                    'display': profile.get('display', self.handle.value),
-                    'verified': True,
-                    'enlisted': profile.get('enlisted', ''),
-                    'org_sid': draxon_org.get('sid', ''),
-                    'org_name': draxon_org.get('name', ''),
-                    'org_rank': draxon_org.get('rank', ''),
-                    'org_stars': draxon_org.get('stars', 0),
-                    'org_status': 'Main' if is_main_org else 'Affiliate',
-                    'last_updated': datetime.datetime.utcnow().isoformat(),
-                    'raw_profile': profile,
-                    'raw_org': draxon_org
-                }
-
-                # Store in database
-                success = await self.cog.db.store_member(str(interaction.user.id), rsi_data)
-                
-                if success:
-                    response_msg = [
-                        "✅ RSI Account Successfully Linked!",
-                        "",
-                        "**Account Information:**",
-                        f"🔹 Handle: {rsi_data['handle']}",
-                        f"🔹 Display Name: {rsi_data['display']}",
-                        f"🔹 Citizen ID: {rsi_data['sid']}",
-                        f"🔹 Enlisted: {rsi_data['enlisted'][:10]}",
-                        "",
-                        "**Organization Status:**",
-                        f"🔹 Organization: {rsi_data['org_name']}",
-                        f"🔹 Status: {rsi_data['org_status']}",
-                        f"🔹 Rank: {rsi_data['org_rank']}",
-                        f"🔹 Stars: {'⭐' * rsi_data['org_stars']}"
-                    ]
-
-                    await interaction.followup.send(
-                        "\n".join(response_msg),
-                        ephemeral=True
-                    )
-                else:
-                    await interaction.followup.send(
-                        "❌ Failed to store RSI account information.",
-                        ephemeral=True
-                    )
-
-            except Exception as e:
-                logger.error(f"Error processing API response: {str(e)}")
-                await interaction.followup.send(
-                    "❌ Error processing RSI account information. Please try again.",
-                    ephemeral=True
-                )
+            linked, message = await self.cog.link_member(str(interaction.user.id), self.handle.value)
+            await interaction.followup.send(message, ephemeral=True)
 
         except Exception as e:
             logger.error(f"Error linking account: {e}")
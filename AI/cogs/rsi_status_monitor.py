@@ -1,7 +1,7 @@
 import discord
 from discord.ext import commands
 import logging
-import requests
+import aiohttp
 from bs4 import BeautifulSoup
 import asyncio
 from typing import Dict, Optional
@@ -12,25 +12,24 @@ logger = logging.getLogger('DraXon_AI')
 class RSIStatusMonitorCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.session = bot.session
         self.max_retries = 3
-        self.timeout = 10
-        self.status_url = "https://status.robertsspaceindustries.com/"
+        self.status_url = bot.rsi_status_url
         self.system_statuses = {
             'platform': 'operational',
             'persistent-universe': 'operational',
             'electronic-access': 'operational'
         }
 
-    async def make_request(self) -> Optional[requests.Response]:
-        """Make HTTP request with retries and timeout"""
+    async def make_request(self) -> Optional[str]:
+        """Fetch the RSI status page with retries; the body, or None if every attempt failed"""
         for attempt in range(self.max_retries):
             try:
-                response = self.session.get(self.status_url, timeout=self.timeout)
-                response.raise_for_status()
-                return response
-            except requests.RequestException as e:
-                logger.warning(f"Request attempt {attempt + 1} failed: {e}")
+                # The shared session applies the total and connect timeouts without blocking the loop
+                async with self.bot.http_session.get(self.status_url) as response:
+                    response.raise_for_status()
+                    return await response.text()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.warning(f"Request attempt {attempt + 1} failed: {str(e) or type(e).__name__}")
                 if attempt == self.max_retries - 1:
                     logger.error(f"All retry attempts failed for {self.status_url}")
                     return None
@@ -45,11 +44,11 @@ class RSIStatusMonitorCog(commands.Cog):
         """Check RSI status page and return current statuses"""
         logger.info("Checking RSI server status...")
         try:
-            response = await self.make_request()
-            if not response:
+            html = await self.make_request()
+            if not html:
                 return self.system_statuses
 
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = BeautifulSoup(html, 'html.parser')
             components = soup.find_all('div', class_='component')
             
             status_changed = False
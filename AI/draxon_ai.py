@@ -1,6 +1,4 @@
 import os
-import certifi
-import requests
 from dotenv import load_dotenv
 import discord
 from discord import app_commands, Activity, ActivityType
@@ -11,6 +9,10 @@ from pathlib import Path
 
 # Import configurations
 from lib.constants import *
+from lib.rsi_db_async import AsyncRSIDatabase
+from lib.db_backup import restore_if_needed
+from lib.http_client import create_http_session
+from lib.rsi_api import RSIApiClient
 
 # Configure logging
 LOG_DIR.mkdir(exist_ok=True)
@@ -43,8 +45,15 @@ class DraXonAIBot(commands.Bot):
         intents.guilds = True
         
         super().__init__(command_prefix='!', intents=intents)
-        self.session = requests.Session()
-        self.session.headers.update(HEADERS)
+        restore_if_needed(RSI_DB_PATH, RSI_DB_BACKUP_DIR)
+        self.rsi_db = AsyncRSIDatabase(RSI_DB_PATH)
+        # RSI endpoints, overridable to run against a local stand-in (benchmarks/rsi_standin.py)
+        self.rsi_api_base_url = os.getenv('RSI_API_BASE_URL', RSI_API_BASE_URL)
+        self.rsi_status_url = os.getenv('RSI_STATUS_URL', RSI_STATUS_URL)
+        self.rsi_incidents_feed_url = os.getenv('RSI_INCIDENTS_FEED_URL', RSI_INCIDENTS_FEED_URL)
+        # Shared aiohttp session for all RSI traffic, created once the loop is running
+        self.http_session = None
+        self.rsi_api = None
         
         # Store for channel IDs
         self.incidents_channel_id = None
@@ -59,6 +68,11 @@ class DraXonAIBot(commands.Bot):
         """Initial setup when bot starts"""
         logger.info("Setup hook starting...")
         try:
+            self.http_session = create_http_session()
+            # One rate-limited client so every cog shares the API key's quota
+            self.rsi_api = RSIApiClient(self.http_session, os.getenv('RSI_API_KEY'),
+                                        base_url=self.rsi_api_base_url)
+
             # Define all cogs to load
             cogs = [
                 'cogs.channels',
@@ -70,7 +84,8 @@ class DraXonAIBot(commands.Bot):
                 'cogs.rsi_incidents_monitor',
                 'cogs.backup',
                 'cogs.rsi_integration',
-                'cogs.membership_monitor'
+                'cogs.membership_monitor',
+                'cogs.database_maintenance'
             ]
             
             # Load each cog only once
@@ -96,8 +111,11 @@ class DraXonAIBot(commands.Bot):
     async def close(self):
         """Cleanup when bot shuts down"""
         logger.info("Bot shutting down, cleaning up...")
-        self.session.close()
         await super().close()
+        if self.http_session:
+            await self.http_session.close()
+        # Flushes any queued group-commit writes before closing connections
+        await self.rsi_db.close()
 
 bot = DraXonAIBot()
 
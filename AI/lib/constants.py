@@ -11,6 +11,13 @@ HEADERS = {
     'User-Agent': 'DraXon_AI_Bot/1.6.1'
 }
 
+# Shared aiohttp session settings
+HTTP_CONNECT_TIMEOUT = 5         # Seconds allowed to open a connection
+HTTP_POOL_LIMIT = 20             # Open connections across all hosts
+HTTP_POOL_LIMIT_PER_HOST = 8     # Open connections per host
+HTTP_DNS_CACHE_TTL = 300         # Seconds DNS lookups are cached
+HTTP_KEEPALIVE_TIMEOUT = 30      # Seconds an idle pooled connection is kept
+
 # Setup directories
 BASE_DIR = Path(__file__).resolve().parent.parent
 LOG_DIR = BASE_DIR / "logs"
@@ -146,12 +153,52 @@ CHANNEL_PERMISSIONS = {
 # RSI API Configuration
 RSI_API_BASE_URL = "https://api.starcitizen-api.com"
 RSI_API_VERSION = "v1"
-RSI_API_MODE = "live"
+RSI_STATUS_URL = "https://status.robertsspaceindustries.com/"
+RSI_INCIDENTS_FEED_URL = "https://status.robertsspaceindustries.com/index.xml"
+RSI_API_MODE = "live"  # Real-time scrape, used where verification must be current
+RSI_API_BULK_MODE = "cache"  # Mode for roster and analytics reads, falling back to RSI_API_MODE
 RSI_ORGANIZATION_SID = "DRAXON"  # Organization SID
+RSI_API_RATE = 5.0  # Sustained starcitizen-api requests per second
+RSI_API_BURST = 10  # Requests allowed in a burst above the sustained rate
+RSI_API_FAILURE_THRESHOLD = 5  # Consecutive failures before the circuit opens
+RSI_API_RESET_TIMEOUT = 60  # Seconds the circuit stays open before a probe
+RSI_API_RESET_TIMEOUT_MAX = 900  # Cap for the open period, doubled on each failed probe
+RSI_DEFERRED_SWEEP_INTERVAL = 15  # Minutes between retries of a deferred role sweep
+RSI_PENDING_LINK_INTERVAL = 5  # Minutes between runs of the queued link processor
+RSI_PENDING_LINK_MAX_AGE = 24  # Hours a queued link keeps being retried while the API is up
+RSI_MEMBER_REFRESH_INTERVAL = 6  # Hours between roster-driven refreshes of linked members
+RSI_MEMBER_REFRESH_CONCURRENCY = 3  # Per-user lookups run at once for handles the roster misses
+RSI_MEMBER_REFRESH_FALLBACK_LIMIT = 25  # Per-user lookups allowed per refresh run
 RSI_MEMBERS_PER_PAGE = 32  # API pagination size
+RSI_ORG_FETCH_CONCURRENCY = 4  # Roster pages fetched at once
+RSI_ROSTER_CACHE_TTL = 600  # Seconds a fetched roster is served as fresh
+RSI_ROSTER_CACHE_MAX_STALE = 21600  # Seconds a stale roster may be served while refreshing
+RSI_PROFILE_CACHE_SIZE = 512  # user/{handle} responses kept (LRU)
+RSI_PROFILE_TTL_FOUND = 900  # Seconds a found profile is reused
+RSI_PROFILE_TTL_NOT_FOUND = 300  # Seconds an unknown handle is remembered
+RSI_PROFILE_TTL_UNAVAILABLE = 30  # Seconds an API-unavailable reply is reused
 
 # Database Configuration
 RSI_DB_PATH = DB_DIR / "rsi_members.db"
+RSI_DB_BUSY_TIMEOUT = 5000       # Milliseconds to wait on a locked database
+RSI_DB_CACHED_STATEMENTS = 128   # Prepared statements cached per connection
+RSI_DB_READER_THREADS = 4        # Threads serving read queries for the async facade
+RSI_DB_WRITE_BATCH_SIZE = 256    # Max writes coalesced into one transaction
+RSI_DB_FLUSH_INTERVAL = 0.05     # Seconds the writer waits to fill a batch
+RSI_DB_STREAM_BATCH_SIZE = 500   # Rows fetched per batch when streaming members
+RSI_DB_RETENTION_INTERVAL = 24   # Hours between history retention runs
+RSI_DB_RETENTION_CHUNK_SIZE = 500  # History rows deleted per transaction
+RSI_DB_STATS_CHECK_INTERVAL = 24  # Hours between stat counter consistency checks
+RSI_DB_BACKUP_DIR = DB_DIR / "backups"
+RSI_DB_BACKUP_INTERVAL = 6       # Hours between online database snapshots
+RSI_DB_BACKUP_KEEP = 14          # Snapshots kept before the oldest is rotated out
+RSI_DB_BACKUP_PAGES_PER_STEP = 64  # Pages copied per online backup step
+RSI_DB_BACKUP_STEP_PAUSE = 0.01  # Seconds paused between backup steps
+RSI_ROSTER_KEYFRAME_INTERVAL = 30  # Roster snapshots between full keyframes
+RSI_DB_RETENTION_DAYS = {        # Days of history kept per table
+    'role_history': 365,
+    'verification_history': 180
+}
 
 # Comparison Status Emojis
 COMPARE_STATUS = {
@@ -0,0 +1,136 @@
+import gzip
+import hashlib
+import logging
+import shutil
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Dict, List
+from lib.constants import (
+    RSI_DB_BACKUP_KEEP,
+    RSI_DB_BACKUP_PAGES_PER_STEP,
+    RSI_DB_BACKUP_STEP_PAUSE
+)
+
+logger = logging.getLogger('DraXon_AI')
+
+BACKUP_SUFFIX = '.db.gz'
+CHECKSUM_SUFFIX = '.sha256'
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _checksum_path(backup: Path) -> Path:
+    return backup.with_name(backup.name + CHECKSUM_SUFFIX)
+
+def list_backups(backup_dir: Path, stem: str) -> List[Path]:
+    """Snapshots of a database, newest first"""
+    if not backup_dir.exists():
+        return []
+    return sorted(backup_dir.glob(f'{stem}-*{BACKUP_SUFFIX}'), reverse=True)
+
+def verify_backup(backup: Path) -> bool:
+    """Check a snapshot against its recorded checksum"""
+    checksum_file = _checksum_path(backup)
+    if not checksum_file.exists():
+        return False
+    expected = checksum_file.read_text().split()[0]
+    return _sha256(backup) == expected
+
+def backup_database(db_path: Path, backup_dir: Path, keep: int = RSI_DB_BACKUP_KEEP,
+                    pages_per_step: int = RSI_DB_BACKUP_PAGES_PER_STEP,
+                    step_pause: float = RSI_DB_BACKUP_STEP_PAUSE) -> Dict:
+    """Take a consistent snapshot of a live database with SQLite's online backup API.
+
+    Pages are copied pages_per_step at a time from a dedicated connection,
+    pausing between steps so other connections keep reading and writing.
+    The copy is integrity-checked, gzip-compressed, checksummed and older
+    snapshots beyond ``keep`` are removed. Blocking: run it in a worker thread.
+    """
+    start = time.perf_counter()
+    backup_dir.mkdir(parents=True, exist_ok=True)
+    stem = db_path.stem
+    name = f"{stem}-{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}"
+    snapshot = backup_dir / f'{name}.db.tmp'
+    target = backup_dir / f'{name}{BACKUP_SUFFIX}'
+
+    try:
+        source = sqlite3.connect(db_path)
+        dest = sqlite3.connect(snapshot)
+        try:
+            source.backup(dest, pages=pages_per_step, sleep=step_pause)
+            result = dest.execute('PRAGMA quick_check').fetchone()[0]
+            if result != 'ok':
+                raise sqlite3.DatabaseError(f"Snapshot failed integrity check: {result}")
+        finally:
+            dest.close()
+            source.close()
+
+        with open(snapshot, 'rb') as f_in, gzip.open(target, 'wb') as f_out:
+            shutil.copyfileobj(f_in, f_out)
+        checksum = _sha256(target)
+        _checksum_path(target).write_text(f'{checksum}  {target.name}\n')
+    finally:
+        snapshot.unlink(missing_ok=True)
+
+    # Rotate old snapshots
+    for old in list_backups(backup_dir, stem)[keep:]:
+        old.unlink(missing_ok=True)
+        _checksum_path(old).unlink(missing_ok=True)
+
+    report = {
+        'path': str(target),
+        'size': target.stat().st_size,
+        'sha256': checksum,
+        'seconds': round(time.perf_counter() - start, 3)
+    }
+    logger.info(f"Database backup written: {report}")
+    return report
+
+def _database_healthy(db_path: Path) -> bool:
+    try:
+        conn = sqlite3.connect(db_path)
+        try:
+            return conn.execute('PRAGMA quick_check').fetchone()[0] == 'ok'
+        finally:
+            conn.close()
+    except sqlite3.DatabaseError as e:
+        logger.error(f"Database {db_path} failed to open: {e}")
+        return False
+
+def restore_if_needed(db_path: Path, backup_dir: Path) -> Optional[Path]:
+    """Restore the newest verified snapshot if the database is missing or corrupt.
+
+    Must run before any connection to db_path is opened. A corrupt database
+    is moved aside rather than deleted. Returns the snapshot restored, if any.
+    """
+    backups = list_backups(backup_dir, db_path.stem)
+    if not backups or (db_path.exists() and _database_healthy(db_path)):
+        return None
+
+    for backup in backups:
+        if not verify_backup(backup):
+            logger.warning(f"Skipping backup with bad checksum: {backup}")
+            continue
+
+        if db_path.exists():
+            aside = db_path.with_name(f"{db_path.name}.corrupt-{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}")
+            db_path.rename(aside)
+            logger.warning(f"Moved damaged database to {aside}")
+        for suffix in ('-wal', '-shm'):
+            db_path.with_name(db_path.name + suffix).unlink(missing_ok=True)
+
+        restoring = db_path.with_name(db_path.name + '.restore')
+        with gzip.open(backup, 'rb') as f_in, open(restoring, 'wb') as f_out:
+            shutil.copyfileobj(f_in, f_out)
+        restoring.replace(db_path)
+        logger.warning(f"Restored {db_path} from backup {backup}")
+        return backup
+
+    logger.error(f"No valid backup available to restore {db_path}")
+    return None
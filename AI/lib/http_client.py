@@ -0,0 +1,30 @@
+import ssl
+import aiohttp
+import certifi
+from typing import Optional
+from lib.constants import (
+    HEADERS,
+    REQUEST_TIMEOUT,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_POOL_LIMIT,
+    HTTP_POOL_LIMIT_PER_HOST,
+    HTTP_DNS_CACHE_TTL,
+    HTTP_KEEPALIVE_TIMEOUT
+)
+
+def create_http_session(ssl_context: Optional[ssl.SSLContext] = None) -> aiohttp.ClientSession:
+    """Build the bot's long-lived HTTP session; must be called inside the running loop.
+
+    Connections are kept alive and pooled per host, so repeated RSI calls
+    skip the TCP and TLS handshakes. Every request has a total and a
+    connect timeout.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=HTTP_POOL_LIMIT,
+        limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+        ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+        keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+        ssl=ssl_context or ssl.create_default_context(cafile=certifi.where())
+    )
+    timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT, sock_connect=HTTP_CONNECT_TIMEOUT)
+    return aiohttp.ClientSession(connector=connector, timeout=timeout, headers=HEADERS)
@@ -0,0 +1,28 @@
+from datetime import datetime, timedelta
+from typing import Optional
+from lib.constants import API_MAINTENANCE_START, API_MAINTENANCE_DURATION
+
+class MaintenanceWindow:
+    """The RSI API's daily maintenance window, in UTC"""
+
+    def __init__(self, start: str = API_MAINTENANCE_START, duration_hours: float = API_MAINTENANCE_DURATION):
+        hour, minute = (int(part) for part in start.split(':'))
+        self.hour = hour
+        self.minute = minute
+        self.duration = timedelta(hours=duration_hours)
+
+    def _latest_start(self, now: datetime) -> datetime:
+        start = now.replace(hour=self.hour, minute=self.minute, second=0, microsecond=0)
+        # Before today's start we may still be inside yesterday's window
+        return start - timedelta(days=1) if start > now else start
+
+    def active(self, now: Optional[datetime] = None) -> bool:
+        """Whether the window is open at now (default: the current UTC time)"""
+        now = now or datetime.utcnow()
+        return now < self._latest_start(now) + self.duration
+
+    def ends_at(self, now: Optional[datetime] = None) -> Optional[datetime]:
+        """When the current window closes, or None outside the window"""
+        now = now or datetime.utcnow()
+        end = self._latest_start(now) + self.duration
+        return end if now < end else None
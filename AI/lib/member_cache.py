@@ -0,0 +1,87 @@
+import threading
+from typing import Optional, Dict, Iterable
+
+class MemberCache:
+    """Identity map of linked member rows indexed by Discord ID and case-folded handle.
+
+    Once warmed from the database the cache is complete, so a miss means the
+    member is not linked and no disk query is needed.
+    """
+
+    def __init__(self):
+        self._by_discord_id: Dict[str, Dict] = {}
+        self._by_handle: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.complete = False
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def handle_key(handle: Optional[str]) -> Optional[str]:
+        """Normalize a handle for case-insensitive lookups"""
+        return handle.casefold() if handle else None
+
+    def warm(self, rows: Iterable):
+        """Replace the cache contents with a full set of member rows"""
+        by_discord_id = {}
+        by_handle = {}
+        for row in rows:
+            by_discord_id[row.discord_id] = row
+            key = self.handle_key(row.handle)
+            if key:
+                by_handle[key] = row.discord_id
+        with self._lock:
+            self._by_discord_id = by_discord_id
+            self._by_handle = by_handle
+            self.complete = True
+
+    def put(self, row):
+        """Insert or replace a member row, keeping the handle index consistent"""
+        discord_id = row.discord_id
+        key = self.handle_key(row.handle)
+        with self._lock:
+            previous = self._by_discord_id.get(discord_id)
+            if previous:
+                old_key = self.handle_key(previous.handle)
+                if old_key and self._by_handle.get(old_key) == discord_id:
+                    del self._by_handle[old_key]
+            if key:
+                # Handles are unique, so a previous owner of this handle was replaced
+                owner = self._by_handle.get(key)
+                if owner and owner != discord_id:
+                    self._by_discord_id.pop(owner, None)
+                self._by_handle[key] = discord_id
+            self._by_discord_id[discord_id] = row
+
+    def get_by_discord_id(self, discord_id: str):
+        """Return the cached member row, or None"""
+        with self._lock:
+            row = self._by_discord_id.get(discord_id)
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return row
+
+    def get_by_handle(self, handle: str):
+        """Return the cached member row with this handle (any case), or None"""
+        key = self.handle_key(handle)
+        with self._lock:
+            discord_id = self._by_handle.get(key)
+            row = self._by_discord_id.get(discord_id) if discord_id else None
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return row
+
+    def stats(self) -> Dict:
+        """Get cache size and hit/miss counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._by_discord_id),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 3) if lookups else 0.0
+            }
@@ -0,0 +1,76 @@
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from lib.constants import (
+    RSI_PROFILE_CACHE_SIZE,
+    RSI_PROFILE_TTL_FOUND,
+    RSI_PROFILE_TTL_NOT_FOUND,
+    RSI_PROFILE_TTL_UNAVAILABLE
+)
+from lib.member_cache import MemberCache
+from lib.rsi_api import api_unavailable
+
+PROFILE_FOUND = 'found'
+PROFILE_NOT_FOUND = 'not_found'
+PROFILE_UNAVAILABLE = 'unavailable'
+
+def classify_profile_response(response: Optional[Dict]) -> str:
+    """Sort a user/{handle} response into found, not found or API unavailable"""
+    if api_unavailable(response):
+        return PROFILE_UNAVAILABLE
+    if response.get('success'):
+        return PROFILE_FOUND
+    return PROFILE_NOT_FOUND
+
+class ProfileCache:
+    """Size-bounded LRU cache of user/{handle} responses.
+
+    Each outcome has its own TTL: profiles are kept longest, unknown handles
+    (typos, retries) a while, and unavailable-API replies only briefly so
+    the cache rides out an outage without masking the recovery.
+    """
+
+    def __init__(self, maxsize: int = RSI_PROFILE_CACHE_SIZE, ttls: Optional[Dict[str, float]] = None):
+        self.maxsize = maxsize
+        self.ttls = ttls or {
+            PROFILE_FOUND: RSI_PROFILE_TTL_FOUND,
+            PROFILE_NOT_FOUND: RSI_PROFILE_TTL_NOT_FOUND,
+            PROFILE_UNAVAILABLE: RSI_PROFILE_TTL_UNAVAILABLE
+        }
+        # handle key -> (expires at, response)
+        self._entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, handle: str) -> Tuple[bool, Optional[Dict]]:
+        """Return (hit, response); a hit may carry a cached None response"""
+        key = MemberCache.handle_key(handle)
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            self._entries.pop(key, None)
+            self.misses += 1
+            return False, None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, entry[1]
+
+    def put(self, handle: str, response: Optional[Dict]) -> str:
+        """Cache a response under the TTL for its outcome; returns the outcome"""
+        outcome = classify_profile_response(response)
+        key = MemberCache.handle_key(handle)
+        self._entries[key] = (time.monotonic() + self.ttls[outcome], response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return outcome
+
+    def stats(self) -> Dict:
+        """Get cache size and hit counters"""
+        return {
+            'size': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions
+        }
@@ -0,0 +1,144 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional
+from lib.constants import RSI_ROSTER_CACHE_TTL, RSI_ROSTER_CACHE_MAX_STALE
+from lib.rsi_api import PRIORITY_COMMAND, PRIORITY_BACKGROUND
+
+logger = logging.getLogger('DraXon_AI')
+
+class CachedRoster:
+    """An org roster together with when it was fetched"""
+    __slots__ = ('members', 'fetched_at', 'stale')
+
+    def __init__(self, members: List[Dict], fetched_at: datetime, stale: bool = False):
+        self.members = members
+        self.fetched_at = fetched_at
+        self.stale = stale
+
+    @property
+    def age(self) -> float:
+        """Seconds since the roster was fetched"""
+        return (datetime.utcnow() - self.fetched_at).total_seconds()
+
+    def age_text(self) -> str:
+        """Human readable data age for command responses"""
+        minutes = int(self.age // 60)
+        if minutes < 1:
+            text = "just now"
+        elif minutes < 60:
+            text = f"{minutes}m old"
+        else:
+            text = f"{minutes // 60}h {minutes % 60}m old"
+        return f"{text}, refreshing" if self.stale else text
+
+class RosterCache:
+    """TTL cache for the org roster with stale-while-revalidate and single-flight fetches.
+
+    Within the TTL the cached roster is served as is. Past it, callers that
+    allow stale data get the old roster immediately while one background
+    fetch refreshes it; callers that don't wait for that same fetch. Any
+    number of concurrent misses share a single in-flight request.
+    """
+
+    def __init__(self, fetch: Callable[[int], Awaitable[Optional[List[Dict]]]],
+                 ttl: float = RSI_ROSTER_CACHE_TTL, max_stale: float = RSI_ROSTER_CACHE_MAX_STALE,
+                 load_last_known: Optional[Callable[[], Awaitable[Optional[Dict]]]] = None):
+        self._fetch = fetch
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self._load_last_known = load_last_known
+        self._seeded = False
+        self._members: Optional[List[Dict]] = None
+        self._fetched_at: Optional[datetime] = None
+        self._inflight: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.fetches = 0
+        self.coalesced = 0
+
+    def _age(self) -> Optional[float]:
+        if self._fetched_at is None:
+            return None
+        return (datetime.utcnow() - self._fetched_at).total_seconds()
+
+    def _snapshot(self, stale: bool) -> CachedRoster:
+        return CachedRoster(self._members, self._fetched_at, stale)
+
+    async def _seed(self):
+        """Start from the persisted last-known roster instead of an empty cache"""
+        if self._seeded or self._load_last_known is None:
+            return
+        self._seeded = True
+        try:
+            latest = await self._load_last_known()
+            if latest and self._members is None:
+                self._members = latest['members']
+                self._fetched_at = datetime.fromisoformat(latest['confirmed_at'])
+        except Exception as e:
+            logger.error(f"Error seeding roster cache: {e}")
+
+    async def _run_fetch(self, priority: int) -> bool:
+        try:
+            members = await self._fetch(priority)
+            if members is None:
+                return False
+            self._members = members
+            self._fetched_at = datetime.utcnow()
+            return True
+        except Exception as e:
+            logger.error(f"Error refreshing roster cache: {e}")
+            return False
+        finally:
+            self.fetches += 1
+            self._inflight = None
+
+    def _refresh(self, priority: int) -> asyncio.Task:
+        if self._inflight is None:
+            self._inflight = asyncio.create_task(self._run_fetch(priority))
+        else:
+            self.coalesced += 1
+        return self._inflight
+
+    async def get(self, allow_stale: bool = True, force: bool = False,
+                  priority: int = PRIORITY_COMMAND) -> Optional[CachedRoster]:
+        """Get the roster, or None if no complete roster is available.
+
+        allow_stale=False never returns data older than the TTL; force=True
+        always waits for a fetch (joining one already in flight). Refreshes
+        behind a stale answer run at background priority.
+        """
+        await self._seed()
+        age = self._age()
+        if not force and age is not None:
+            if age < self.ttl:
+                self.hits += 1
+                return self._snapshot(False)
+            if allow_stale and age < self.max_stale:
+                self.stale_hits += 1
+                self._refresh(PRIORITY_BACKGROUND)
+                return self._snapshot(True)
+
+        self.misses += 1
+        # Shielded so a cancelled caller does not cancel the fetch others are waiting on
+        if await asyncio.shield(self._refresh(priority)):
+            return self._snapshot(False)
+
+        age = self._age()
+        if allow_stale and age is not None and age < self.max_stale:
+            logger.warning(f"Roster refresh failed, serving roster from {int(age)}s ago")
+            return self._snapshot(True)
+        return None
+
+    def stats(self) -> Dict:
+        """Get cache counters and the current data age"""
+        age = self._age()
+        return {
+            'age': round(age) if age is not None else None,
+            'hits': self.hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses,
+            'fetches': self.fetches,
+            'coalesced': self.coalesced
+        }
@@ -0,0 +1,57 @@
+from typing import Dict, List, Iterable, Tuple
+from lib.member_cache import MemberCache
+
+ROSTER_JOINED = 'joined'
+ROSTER_LEFT = 'left'
+ROSTER_CHANGED = 'changed'
+
+def index_roster(members: Iterable[Dict]) -> Dict[str, Dict]:
+    """Key an org roster by casefolded handle, dropping duplicate entries"""
+    roster = {}
+    for member in members:
+        key = MemberCache.handle_key(member.get('handle'))
+        if key:
+            roster[key] = member
+    return roster
+
+def diff_rosters(previous: Dict[str, Dict], current: Dict[str, Dict]) -> List[Tuple[str, str, Dict]]:
+    """Encode the move from one indexed roster to the next as (handle, event, details) events.
+
+    Joins carry the full member, leaves the last-known member and changes
+    only the differing fields as ``{field: [old, new]}``.
+    """
+    events = []
+    for key, member in current.items():
+        old = previous.get(key)
+        if old is None:
+            events.append((member['handle'], ROSTER_JOINED, member))
+            continue
+        changes = {
+            field: [old.get(field), member.get(field)]
+            for field in old.keys() | member.keys()
+            if old.get(field) != member.get(field)
+        }
+        if changes:
+            events.append((member['handle'], ROSTER_CHANGED, changes))
+    for key, member in previous.items():
+        if key not in current:
+            events.append((member['handle'], ROSTER_LEFT, member))
+    return events
+
+def apply_roster_events(roster: Dict[str, Dict], events: Iterable[Tuple[str, str, Dict]]) -> Dict[str, Dict]:
+    """Replay diff_rosters events onto an indexed roster in place"""
+    for handle, event, details in events:
+        key = MemberCache.handle_key(handle)
+        if event == ROSTER_JOINED:
+            roster[key] = details
+        elif event == ROSTER_LEFT:
+            roster.pop(key, None)
+        elif event == ROSTER_CHANGED:
+            member = dict(roster.get(key, {}))
+            for field, (_, new) in details.items():
+                if new is None:
+                    member.pop(field, None)
+                else:
+                    member[field] = new
+            roster[key] = member
+    return roster
@@ -0,0 +1,342 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import Counter, deque
+from datetime import datetime
+from typing import Deque, Dict, List, Optional, Tuple
+import aiohttp
+from lib.maintenance_window import MaintenanceWindow
+from lib.constants import (
+    RSI_API_BASE_URL,
+    RSI_API_VERSION,
+    RSI_API_MODE,
+    RSI_API_RATE,
+    RSI_API_BURST,
+    RSI_API_FAILURE_THRESHOLD,
+    RSI_API_RESET_TIMEOUT,
+    RSI_API_RESET_TIMEOUT_MAX
+)
+
+logger = logging.getLogger('DraXon_AI')
+
+# Request priority classes, most urgent first
+PRIORITY_INTERACTIVE = 0  # A member waiting on /draxon-link
+PRIORITY_COMMAND = 1      # Leadership commands
+PRIORITY_BACKGROUND = 2   # Sweeps and cache refreshes
+PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: 'interactive',
+    PRIORITY_COMMAND: 'command',
+    PRIORITY_BACKGROUND: 'background'
+}
+
+def api_unavailable(response: Optional[Dict]) -> bool:
+    """True for no response or the API's own 'Can't process the request.' outage reply"""
+    if response is None:
+        return True
+    return (not response.get('success') and response.get('message') == "Can't process the request."
+            and response.get('data') is None)
+
+def has_data(response: Optional[Dict]) -> bool:
+    """True when the API answered successfully with a data payload"""
+    return bool(response) and bool(response.get('success')) and response.get('data') is not None
+
+def _percentile_ms(ordered: List[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] * 1000, 1)
+
+class TokenBucket:
+    """Token-bucket rate limiter that hands out tokens by priority, then arrival order"""
+
+    def __init__(self, rate: float = RSI_API_RATE, burst: int = RSI_API_BURST):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._dispatcher: Optional[asyncio.Task] = None
+        # Recent waits in seconds per priority class
+        self.waits: Dict[int, Deque[float]] = {priority: deque(maxlen=256) for priority in PRIORITY_NAMES}
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    async def acquire(self, priority: int = PRIORITY_COMMAND):
+        """Wait for a token; higher priority waiters are served first"""
+        start = time.monotonic()
+        self._refill()
+        if not self._waiters and self._tokens >= 1:
+            self._tokens -= 1
+        else:
+            future = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+            if self._dispatcher is None:
+                self._dispatcher = asyncio.create_task(self._dispatch())
+            await future
+        self.waits[priority].append(time.monotonic() - start)
+
+    async def _dispatch(self):
+        try:
+            while self._waiters:
+                self._refill()
+                if self._tokens < 1:
+                    await asyncio.sleep((1 - self._tokens) / self.rate)
+                    continue
+                _, _, future = heapq.heappop(self._waiters)
+                # Cancelled waiters give their place up without using a token
+                if not future.done():
+                    self._tokens -= 1
+                    future.set_result(None)
+        finally:
+            self._dispatcher = None
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker so callers fail fast while the API is down.
+
+    Opens after failure_threshold consecutive failures. Once reset_timeout
+    has passed it lets a single probe through; success closes it, failure
+    reopens it for twice as long (up to max_reset_timeout).
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = RSI_API_FAILURE_THRESHOLD,
+                 reset_timeout: float = RSI_API_RESET_TIMEOUT,
+                 max_reset_timeout: float = RSI_API_RESET_TIMEOUT_MAX):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.short_circuited = 0
+        self._open_for = reset_timeout
+        self._opened_at = 0.0
+        self._probing = False
+
+    def _check_timeout(self):
+        if self.state == self.OPEN and time.monotonic() - self._opened_at >= self._open_for:
+            self.state = self.HALF_OPEN
+
+    @property
+    def available(self) -> bool:
+        """Whether a request could be attempted now (a half-open probe counts)"""
+        self._check_timeout()
+        return self.state != self.OPEN
+
+    def retry_in(self) -> float:
+        """Seconds until the next probe is allowed"""
+        self._check_timeout()
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self._open_for - time.monotonic())
+
+    def allow_request(self) -> bool:
+        """Claim permission to send a request; only one probe at a time when half-open"""
+        self._check_timeout()
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        self.short_circuited += 1
+        return False
+
+    def record_success(self):
+        if self.state != self.CLOSED:
+            logger.info("RSI API recovered, circuit closed")
+        self.state = self.CLOSED
+        self.failures = 0
+        self._open_for = self.reset_timeout
+        self._probing = False
+
+    def record_failure(self):
+        if self.state == self.HALF_OPEN:
+            self._probing = False
+            self._open(min(self._open_for * 2, self.max_reset_timeout))
+            return
+        self.failures += 1
+        if self.state == self.CLOSED and self.failures >= self.failure_threshold:
+            self._open(self.reset_timeout)
+
+    def abandon(self):
+        """Release a probe that ended without an outcome (e.g. cancelled)"""
+        self._probing = False
+
+    def _open(self, duration: float):
+        self.state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._open_for = duration
+        self.trips += 1
+        logger.warning(f"RSI API circuit opened after {self.failures} failures, "
+                       f"next probe in {int(duration)}s")
+
+    def health(self) -> Dict:
+        """Get the breaker state for cogs and status displays"""
+        self._check_timeout()
+        return {
+            'state': self.state,
+            'available': self.state != self.OPEN,
+            'consecutive_failures': self.failures,
+            'retry_in': round(self.retry_in()),
+            'trips': self.trips,
+            'short_circuited': self.short_circuited
+        }
+
+class RSIApiClient:
+    """Single client for starcitizen-api.com, shared by every cog.
+
+    Requests pass through one token bucket, so overlapping roster fetches,
+    sweeps and link attempts stay under the key's quota together. Identical
+    GETs already in flight are merged into one request. A circuit breaker
+    turns calls into instant failures (None) while the API is down, and
+    background requests are refused during the daily maintenance window.
+
+    Each call names an API mode: RSI_API_BULK_MODE (cached data) for bulk
+    reads, RSI_API_MODE (live scrape) where freshness matters. A cached-mode
+    answer without data is retried once in live mode.
+    """
+
+    def __init__(self, session: aiohttp.ClientSession, api_key: Optional[str],
+                 base_url: str = RSI_API_BASE_URL, limiter: Optional[TokenBucket] = None,
+                 breaker: Optional[CircuitBreaker] = None,
+                 maintenance: Optional[MaintenanceWindow] = None):
+        self.session = session
+        self.api_key = api_key
+        self.base_url = base_url
+        self.limiter = limiter or TokenBucket()
+        self.breaker = breaker or CircuitBreaker()
+        self.maintenance = maintenance or MaintenanceWindow()
+        # Calls refused in the window, and whole jobs deferred past it
+        self.maintenance_avoided_calls = 0
+        self.maintenance_deferred_jobs = 0
+        self._inflight: Dict[Tuple, asyncio.Task] = {}
+        self.requests = 0
+        self.coalesced = 0
+        self.mode_requests: Counter = Counter()
+        self.mode_fallbacks = 0
+
+    @property
+    def available(self) -> bool:
+        """Whether the circuit lets requests through; cogs check this to fail fast"""
+        return self.breaker.available
+
+    def accepts(self, priority: int) -> bool:
+        """Whether a request at this priority would be attempted now"""
+        if priority == PRIORITY_BACKGROUND and self.maintenance.active():
+            return False
+        return self.breaker.available
+
+    def defer_for_maintenance(self, job: str) -> Optional[datetime]:
+        """If the maintenance window is open, count the job as deferred and return when it closes"""
+        ends_at = self.maintenance.ends_at()
+        if ends_at is not None:
+            self.maintenance_deferred_jobs += 1
+            logger.info(f"Deferring {job} until the API maintenance window ends at {ends_at:%H:%M} UTC")
+        return ends_at
+
+    def _url(self, endpoint: str, mode: str) -> str:
+        return f"{self.base_url}/{self.api_key}/{RSI_API_VERSION}/{mode}/{endpoint}"
+
+    async def get(self, endpoint: str, params: Optional[Dict] = None,
+                  priority: int = PRIORITY_COMMAND, mode: str = RSI_API_MODE) -> Optional[Dict]:
+        """GET an API endpoint; returns the JSON body, or None on failure"""
+        response = await self._get(endpoint, params, priority, mode)
+        # The API answered but had nothing cached: fall back to a live scrape
+        if mode != RSI_API_MODE and not api_unavailable(response) and not has_data(response):
+            self.mode_fallbacks += 1
+            logger.info(f"No {mode} data for {endpoint}, falling back to {RSI_API_MODE}")
+            response = await self._get(endpoint, params, priority, RSI_API_MODE)
+        return response
+
+    async def _get(self, endpoint: str, params: Optional[Dict], priority: int, mode: str) -> Optional[Dict]:
+        key = (mode, endpoint, tuple(sorted((params or {}).items())))
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._request(endpoint, params, priority, mode))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._inflight.pop(key, None)
+                                   if self._inflight.get(key) is done else None)
+        else:
+            self.coalesced += 1
+        # Shielded so one caller giving up does not cancel the request for the others
+        return await asyncio.shield(task)
+
+    async def _request(self, endpoint: str, params: Optional[Dict], priority: int, mode: str) -> Optional[Dict]:
+        if priority == PRIORITY_BACKGROUND and self.maintenance.active():
+            self.maintenance_avoided_calls += 1
+            return None
+        if not self.breaker.available:
+            self.breaker.short_circuited += 1
+            return None
+        await self.limiter.acquire(priority)
+        # Checked again: the circuit may have opened while this request was queued
+        if not self.breaker.allow_request():
+            return None
+
+        self.requests += 1
+        self.mode_requests[mode] += 1
+        try:
+            async with self.session.get(self._url(endpoint, mode), params=params) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    if api_unavailable(data):
+                        self.breaker.record_failure()
+                    else:
+                        self.breaker.record_success()
+                    return data
+                logger.error(f"API request failed: {response.status}")
+                # Client errors still prove the API is up
+                if response.status >= 500 or response.status == 429:
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_success()
+                return None
+        except asyncio.CancelledError:
+            self.breaker.abandon()
+            raise
+        except asyncio.TimeoutError:
+            logger.error(f"API request timed out: {endpoint}")
+            self.breaker.record_failure()
+            return None
+        except Exception as e:
+            logger.error(f"Error fetching API data: {e}")
+            self.breaker.record_failure()
+            return None
+
+    def stats(self) -> Dict:
+        """Get request, queue and wait-time metrics"""
+        waits = {}
+        for priority, samples in self.limiter.waits.items():
+            ordered = sorted(samples)
+            waits[PRIORITY_NAMES[priority]] = {
+                'count': len(ordered),
+                'p50_ms': _percentile_ms(ordered, 0.5),
+                'p95_ms': _percentile_ms(ordered, 0.95),
+                'max_ms': _percentile_ms(ordered, 1.0)
+            }
+        return {
+            'requests': self.requests,
+            'coalesced': self.coalesced,
+            'in_flight': len(self._inflight),
+            'modes': dict(self.mode_requests),
+            'mode_fallbacks': self.mode_fallbacks,
+            'queue_depth': self.limiter.queue_depth,
+            'wait': waits,
+            'health': self.breaker.health(),
+            'maintenance': {
+                'active': self.maintenance.active(),
+                'avoided_calls': self.maintenance_avoided_calls,
+                'deferred_jobs': self.maintenance_deferred_jobs
+            }
+        }
@@ -1,21 +1,318 @@
 import sqlite3
 import json
+import hashlib
 import logging
+import zlib
+import threading
 from pathlib import Path
-from typing import Optional, Dict, List
-from datetime import datetime
+from typing import Optional, Dict, List, Callable, Tuple, Any, Iterator
+from datetime import datetime, timedelta
+from lib.constants import (
+    RSI_DB_BUSY_TIMEOUT,
+    RSI_DB_CACHED_STATEMENTS,
+    RSI_DB_RETENTION_CHUNK_SIZE,
+    RSI_DB_RETENTION_DAYS,
+    RSI_DB_STREAM_BATCH_SIZE,
+    RSI_ROSTER_KEYFRAME_INTERVAL
+)
+from lib.member_cache import MemberCache
+from lib.roster_snapshots import (
+    ROSTER_JOINED,
+    ROSTER_LEFT,
+    ROSTER_CHANGED,
+    index_roster,
+    diff_rosters,
+    apply_roster_events
+)
 
 logger = logging.getLogger('DraXon_AI')
 
+# Typed columns of rsi_members, in the order MemberRow expects them
+MEMBER_COLUMNS = ('discord_id, handle, sid, display_name, enlisted, org_status, '
+                  'org_rank, org_stars, verified, last_updated')
+
+# roster_snapshots columns returned with a roster, excluding the keyframe payload
+ROSTER_SNAPSHOT_COLUMNS = 'id, taken_at, confirmed_at, member_count'
+
+# Payload keys that change on every refresh and must not count as a content change
+VOLATILE_MEMBER_FIELDS = ('last_updated',)
+
+# Columns whose changes are recorded as transitions in verification_history
+TRACKED_MEMBER_FIELDS = ('handle', 'org_status', 'org_rank', 'org_stars', 'verified')
+
+def _bump_stat(name: str, delta: str) -> str:
+    """Trigger statement adding delta to a db_stats counter (both SQL expressions)"""
+    return (f"INSERT INTO db_stats (name, value) VALUES ({name}, {delta}) "
+            f"ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;")
+
+_NEW_STATUS = "'org_status:' || IFNULL(NEW.org_status, '')"
+_OLD_STATUS = "'org_status:' || IFNULL(OLD.org_status, '')"
+
+# Rebuild every db_stats counter from the real tables
+STATS_RECOUNT = [
+    'DELETE FROM db_stats',
+    "INSERT INTO db_stats (name, value) SELECT 'total_members', COUNT(*) FROM rsi_members",
+    "INSERT INTO db_stats (name, value) SELECT 'verified_members', COUNT(*) FROM rsi_members WHERE verified = 1",
+    "INSERT INTO db_stats (name, value) SELECT 'org_status:' || IFNULL(org_status, ''), COUNT(*) "
+    "FROM rsi_members GROUP BY 1",
+    "INSERT INTO db_stats (name, value) SELECT 'role_changes', COUNT(*) FROM role_history",
+    "INSERT INTO db_stats (name, value) SELECT 'verification_events', COUNT(*) FROM verification_history"
+]
+
+# Versioned schema changes applied in order on top of the base tables:
+# (version, description, statements, transactional). PRAGMA user_version
+# records the last version applied to a database file. Non-transactional
+# migrations hold statements such as VACUUM that cannot run in a transaction.
+SCHEMA_MIGRATIONS = [
+    (1, "Secondary indexes for history lookups and case-insensitive handles", [
+        'CREATE INDEX IF NOT EXISTS idx_role_history_member '
+        'ON role_history(discord_id, timestamp)',
+        'CREATE INDEX IF NOT EXISTS idx_role_history_timestamp '
+        'ON role_history(timestamp)',
+        'CREATE INDEX IF NOT EXISTS idx_verification_history_member '
+        'ON verification_history(discord_id, timestamp)',
+        'CREATE INDEX IF NOT EXISTS idx_verification_history_timestamp '
+        'ON verification_history(timestamp)',
+        'CREATE INDEX IF NOT EXISTS idx_rsi_members_handle_nocase '
+        'ON rsi_members(handle COLLATE NOCASE)'
+    ], True),
+    (2, "Content hash for change-detecting member upserts", [
+        'ALTER TABLE rsi_members ADD COLUMN content_hash TEXT'
+    ], True),
+    (3, "Incremental auto-vacuum so retention deletes shrink the file", [
+        'PRAGMA auto_vacuum = INCREMENTAL',
+        'VACUUM'
+    ], False),
+    (4, "Trigger-maintained counters for get_database_stats", [
+        'CREATE TABLE IF NOT EXISTS db_stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL)',
+        f"""CREATE TRIGGER IF NOT EXISTS stats_member_insert AFTER INSERT ON rsi_members BEGIN
+            {_bump_stat("'total_members'", '1')}
+            {_bump_stat("'verified_members'", '(NEW.verified = 1)')}
+            {_bump_stat(_NEW_STATUS, '1')}
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS stats_member_delete AFTER DELETE ON rsi_members BEGIN
+            {_bump_stat("'total_members'", '-1')}
+            {_bump_stat("'verified_members'", '-(OLD.verified = 1)')}
+            {_bump_stat(_OLD_STATUS, '-1')}
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS stats_member_update
+        AFTER UPDATE OF verified, org_status ON rsi_members BEGIN
+            {_bump_stat("'verified_members'", '(NEW.verified = 1) - (OLD.verified = 1)')}
+            {_bump_stat(_OLD_STATUS, '-1')}
+            {_bump_stat(_NEW_STATUS, '1')}
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS stats_role_insert AFTER INSERT ON role_history BEGIN
+            {_bump_stat("'role_changes'", '1')}
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS stats_role_delete AFTER DELETE ON role_history BEGIN
+            {_bump_stat("'role_changes'", '-1')}
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS stats_verification_insert AFTER INSERT ON verification_history BEGIN
+            {_bump_stat("'verification_events'", '1')}
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS stats_verification_delete AFTER DELETE ON verification_history BEGIN
+            {_bump_stat("'verification_events'", '-1')}
+        END""",
+        *STATS_RECOUNT
+    ], True),
+    (5, "Org roster snapshots stored as keyframes plus join/leave/change events", [
+        # roster holds the full encoded roster on keyframes and is NULL on deltas
+        """CREATE TABLE IF NOT EXISTS roster_snapshots (
+            id INTEGER PRIMARY KEY,
+            taken_at TIMESTAMP NOT NULL,
+            confirmed_at TIMESTAMP NOT NULL,
+            keyframe INTEGER NOT NULL DEFAULT 0,
+            member_count INTEGER NOT NULL,
+            roster BLOB
+        )""",
+        """CREATE TABLE IF NOT EXISTS roster_events (
+            snapshot_id INTEGER NOT NULL REFERENCES roster_snapshots(id),
+            handle TEXT NOT NULL COLLATE NOCASE,
+            event TEXT NOT NULL,
+            details BLOB NOT NULL
+        )""",
+        'CREATE INDEX IF NOT EXISTS idx_roster_snapshots_taken_at ON roster_snapshots(taken_at)',
+        'CREATE INDEX IF NOT EXISTS idx_roster_snapshots_keyframe ON roster_snapshots(keyframe, id)',
+        'CREATE INDEX IF NOT EXISTS idx_roster_events_snapshot ON roster_events(snapshot_id)',
+        'CREATE INDEX IF NOT EXISTS idx_roster_events_handle ON roster_events(handle, snapshot_id)'
+    ], True),
+    (6, "Link requests queued during the API maintenance window", [
+        """CREATE TABLE IF NOT EXISTS pending_links (
+            discord_id TEXT PRIMARY KEY,
+            handle TEXT NOT NULL,
+            requested_at TIMESTAMP NOT NULL
+        )"""
+    ], True)
+]
+
+# Trigram full-text index over member handles and display names, kept in step
+# by triggers. The FTS rowid is the numeric Discord ID, which VACUUM cannot
+# renumber, so trigger maintenance is a rowid lookup. The trigram tokenizer
+# needs SQLite 3.34+, so this is not a migration: ensure_member_fts applies it
+# on start where supported, and member lookup falls back to LIKE matching.
+MEMBER_FTS_SCHEMA = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS rsi_members_fts USING fts5(
+        discord_id UNINDEXED, handle, display_name, tokenize = 'trigram'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS fts_member_insert AFTER INSERT ON rsi_members BEGIN
+        INSERT INTO rsi_members_fts (rowid, discord_id, handle, display_name)
+        VALUES (CAST(NEW.discord_id AS INTEGER), NEW.discord_id, NEW.handle, NEW.display_name);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS fts_member_delete AFTER DELETE ON rsi_members BEGIN
+        DELETE FROM rsi_members_fts WHERE rowid = CAST(OLD.discord_id AS INTEGER);
+    END""",
+    # Upserts always assign handle and display_name, so only real changes reach the index
+    """CREATE TRIGGER IF NOT EXISTS fts_member_update
+    AFTER UPDATE OF handle, display_name ON rsi_members
+    WHEN OLD.handle IS NOT NEW.handle OR OLD.display_name IS NOT NEW.display_name BEGIN
+        UPDATE rsi_members_fts SET handle = NEW.handle, display_name = NEW.display_name
+        WHERE rowid = CAST(OLD.discord_id AS INTEGER);
+    END"""
+]
+MEMBER_FTS_REBUILD = [
+    'DELETE FROM rsi_members_fts',
+    'INSERT INTO rsi_members_fts (rowid, discord_id, handle, display_name) '
+    'SELECT CAST(discord_id AS INTEGER), discord_id, handle, display_name FROM rsi_members'
+]
+
+def trigram_supported(conn: sqlite3.Connection) -> bool:
+    """Whether this SQLite build has FTS5 with the trigram tokenizer (3.34+)"""
+    try:
+        conn.execute("CREATE VIRTUAL TABLE temp.trigram_probe USING fts5(probe, tokenize = 'trigram')")
+        conn.execute('DROP TABLE temp.trigram_probe')
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+# History tables subject to retention, each indexed on timestamp
+HISTORY_TABLES = ('role_history', 'verification_history')
+
+# raw_data storage codec: a version byte followed by zlib-compressed JSON.
+# Rows written before the codec existed hold plain JSON text and still decode.
+RAW_DATA_CODEC_ZLIB_JSON = 1
+
+def encode_raw_data(data: Dict) -> bytes:
+    """Encode a member payload for the raw_data column"""
+    encoded = json.dumps(data, separators=(',', ':')).encode('utf-8')
+    return bytes((RAW_DATA_CODEC_ZLIB_JSON,)) + zlib.compress(encoded)
+
+def decode_raw_data(value) -> Dict:
+    """Decode a raw_data value written by any codec version"""
+    if not value:
+        return {}
+    if isinstance(value, str):
+        return json.loads(value)
+    if value[0] == RAW_DATA_CODEC_ZLIB_JSON:
+        return json.loads(zlib.decompress(value[1:]))
+    raise ValueError(f"Unknown raw_data codec version {value[0]}")
+
+def member_content_hash(data: Dict) -> str:
+    """Stable hash of a member payload, ignoring volatile fields"""
+    relevant = {k: v for k, v in data.items() if k not in VOLATILE_MEMBER_FIELDS}
+    encoded = json.dumps(relevant, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha1(encoded.encode('utf-8')).hexdigest()
+
+class MemberRow:
+    """Compact, read-only view of an rsi_members row.
+
+    Only the typed columns are materialized; the raw_data payload is decoded
+    on first access to ``data``, loading it from disk if it was not selected.
+    """
+    __slots__ = ('discord_id', 'handle', 'sid', 'display_name', 'enlisted', 'org_status',
+                 'org_rank', 'org_stars', 'verified', 'last_updated',
+                 '_raw_data', '_data', '_loader')
+
+    def __init__(self, discord_id: str, handle: Optional[str], sid: Optional[str],
+                 display_name: Optional[str], enlisted: Optional[str], org_status: Optional[str],
+                 org_rank: Optional[str], org_stars: Optional[int], verified: Optional[bool],
+                 last_updated: Optional[str], raw_data=None,
+                 loader: Optional[Callable[[str], Optional[bytes]]] = None):
+        self.discord_id = discord_id
+        self.handle = handle
+        self.sid = sid
+        self.display_name = display_name
+        self.enlisted = enlisted
+        self.org_status = org_status
+        self.org_rank = org_rank
+        self.org_stars = org_stars or 0
+        self.verified = bool(verified)
+        self.last_updated = last_updated
+        self._raw_data = raw_data
+        self._data = None
+        self._loader = loader
+
+    @property
+    def data(self) -> Dict:
+        """Full stored payload, decoded lazily (treat as read-only)"""
+        if self._data is None:
+            if self._raw_data is None and self._loader:
+                self._raw_data = self._loader(self.discord_id)
+            self._data = decode_raw_data(self._raw_data)
+            self._loader = None
+        return self._data
+
+    def __repr__(self) -> str:
+        return f"<MemberRow discord_id={self.discord_id} handle={self.handle} org_status={self.org_status}>"
+
 class RSIDatabase:
-    def __init__(self, db_path: Path):
+    def __init__(self, db_path: Path, busy_timeout: int = RSI_DB_BUSY_TIMEOUT,
+                 cached_statements: int = RSI_DB_CACHED_STATEMENTS):
         self.db_path = db_path
+        self.busy_timeout = busy_timeout
+        self.cached_statements = cached_statements
+        # One long-lived connection per thread, tracked so close() can release them all
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self.cache = MemberCache()
+        # Change-detection counters for store_member, counted once committed
+        self.member_writes = 0
+        self.member_writes_skipped = 0
+        # Last-known org roster as (snapshot, roster keyed by handle); replaced, never mutated
+        self._latest_roster: Optional[Tuple[Dict, Dict[str, Dict]]] = None
+        self._roster_lock = threading.Lock()
+        # Set by ensure_member_fts; lookup_members uses LIKE matching without it
+        self.member_fts = False
         self.init_db()
+        self.warm_cache()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a new connection configured for WAL journaling"""
+        conn = sqlite3.connect(
+            self.db_path,
+            cached_statements=self.cached_statements,
+            check_same_thread=False  # Only used by its owning thread, except in close()
+        )
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'PRAGMA busy_timeout={int(self.busy_timeout)}')
+        return conn
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """Get the calling thread's pooled connection, opening it on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def close(self):
+        """Close every pooled connection"""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except Exception as e:
+                logger.error(f"Error closing database connection: {e}")
+        self._local = threading.local()
 
     def init_db(self):
         """Initialize the database with required tables"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_connection() as conn:
                 cursor = conn.cursor()
                 
                 # Create members table
@@ -62,62 +359,254 @@ class RSIDatabase:
                 ''')
                 
                 conn.commit()
-                logger.info("RSI database initialized successfully")
+
+            self.migrate()
+            self.ensure_member_fts()
+            logger.info("RSI database initialized successfully")
         except Exception as e:
             logger.error(f"Error initializing database: {e}")
             raise
 
-    async def store_member(self, discord_id: str, data: Dict) -> bool:
-        """Store member RSI data in database"""
+    def get_schema_version(self) -> int:
+        """Get the last schema migration applied to the database"""
+        return self._get_connection().execute('PRAGMA user_version').fetchone()[0]
+
+    def migrate(self):
+        """Apply pending schema migrations, each in its own transaction"""
+        conn = self._get_connection()
+        current = self.get_schema_version()
+        for version, description, statements, transactional in SCHEMA_MIGRATIONS:
+            if version <= current:
+                continue
+            try:
+                if transactional:
+                    conn.execute('BEGIN')
+                for statement in statements:
+                    conn.execute(statement)
+                conn.execute(f'PRAGMA user_version = {int(version)}')
+                conn.commit()
+                logger.info(f"Applied RSI database migration {version}: {description}")
+            except Exception as e:
+                conn.rollback()
+                logger.error(f"Error applying RSI database migration {version}: {e}")
+                raise
+
+    def ensure_member_fts(self):
+        """Create the member trigram index if SQLite supports it, filling it when new"""
+        conn = self._get_connection()
+        if not trigram_supported(conn):
+            self.member_fts = False
+            logger.warning(f"SQLite {sqlite3.sqlite_version} lacks the FTS5 trigram tokenizer (3.34+ needed); "
+                           f"member lookup falls back to LIKE matching")
+            return
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            exists = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'rsi_members_fts'").fetchone()
+            conn.execute('BEGIN')
+            for statement in MEMBER_FTS_SCHEMA + ([] if exists else MEMBER_FTS_REBUILD):
+                conn.execute(statement)
+            conn.commit()
+            self.member_fts = True
+        except Exception as e:
+            conn.rollback()
+            self.member_fts = False
+            logger.error(f"Error creating member lookup index, falling back to LIKE matching: {e}")
+
+    def warm_cache(self):
+        """Load every linked member into the in-memory cache"""
+        try:
+            with self._get_connection() as conn:
                 cursor = conn.cursor()
-                
-                # Check if member exists
-                cursor.execute('SELECT * FROM rsi_members WHERE discord_id = ?', (discord_id,))
-                existing = cursor.fetchone()
-                
-                # Store essential data in columns and full data as JSON
-                cursor.execute('''
-                    INSERT OR REPLACE INTO rsi_members (
-                        discord_id, handle, sid, display_name, enlisted,
-                        org_status, org_rank, org_stars, verified,
-                        last_updated, raw_data
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    discord_id,
-                    data.get('handle'),
-                    data.get('sid'),
-                    data.get('display'),
-                    data.get('enlisted'),
-                    data.get('org_status'),
-                    data.get('org_rank'),
-                    data.get('org_stars', 0),
-                    data.get('verified', False),
-                    datetime.utcnow().isoformat(),
-                    json.dumps(data)
-                ))
-
-                # Log verification attempt
-                cursor.execute('''
-                    INSERT INTO verification_history (
-                        discord_id, action, status, timestamp, details
-                    ) VALUES (?, ?, ?, ?, ?)
-                ''', (
-                    discord_id,
-                    'update' if existing else 'create',
-                    True,
-                    datetime.utcnow().isoformat(),
-                    json.dumps({
-                        'handle': data.get('handle'),
-                        'org_status': data.get('org_status'),
-                        'verified': data.get('verified')
-                    })
-                ))
-                
-                conn.commit()
+                # Keep the payload undecoded; MemberRow decodes it on demand
+                cursor.execute(f'SELECT {MEMBER_COLUMNS}, raw_data FROM rsi_members')
+                self.cache.warm(MemberRow(*row) for row in cursor.fetchall())
+                logger.info(f"Member cache warmed with {self.cache.stats()['size']} members")
+        except Exception as e:
+            logger.error(f"Error warming member cache: {e}")
+
+    def _store_member(self, conn: sqlite3.Connection, discord_id: str, data: Dict) -> Optional[MemberRow]:
+        """Upsert a member without committing; returns None when nothing changed.
+
+        A verification_history row is only written when the member is created
+        or one of TRACKED_MEMBER_FIELDS actually changes.
+        """
+        cursor = conn.cursor()
+        content_hash = member_content_hash(data)
+        
+        # Check if member exists and whether anything changed
+        cursor.execute('''
+            SELECT content_hash, handle, org_status, org_rank, org_stars, verified
+            FROM rsi_members WHERE discord_id = ?
+        ''', (discord_id,))
+        existing = cursor.fetchone()
+        if existing and existing[0] == content_hash:
+            return None
+
+        row = MemberRow(
+            discord_id,
+            data.get('handle'),
+            data.get('sid'),
+            data.get('display'),
+            data.get('enlisted'),
+            data.get('org_status'),
+            data.get('org_rank'),
+            data.get('org_stars', 0),
+            data.get('verified', False),
+            datetime.utcnow().isoformat(),
+            encode_raw_data(data)
+        )
+
+        # A handle re-linked from another Discord account replaces that link. Handles
+        # compare case-insensitively, as in MemberCache, so 'alpha' replaces 'Alpha'
+        cursor.execute(
+            'DELETE FROM rsi_members WHERE handle = ? COLLATE NOCASE AND discord_id != ?',
+            (row.handle, discord_id)
+        )
+        
+        # Store essential data in columns and full data as JSON
+        cursor.execute('''
+            INSERT INTO rsi_members (
+                discord_id, handle, sid, display_name, enlisted,
+                org_status, org_rank, org_stars, verified,
+                last_updated, raw_data, content_hash
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(discord_id) DO UPDATE SET
+                handle = excluded.handle,
+                sid = excluded.sid,
+                display_name = excluded.display_name,
+                enlisted = excluded.enlisted,
+                org_status = excluded.org_status,
+                org_rank = excluded.org_rank,
+                org_stars = excluded.org_stars,
+                verified = excluded.verified,
+                last_updated = excluded.last_updated,
+                raw_data = excluded.raw_data,
+                content_hash = excluded.content_hash
+        ''', (
+            row.discord_id,
+            row.handle,
+            row.sid,
+            row.display_name,
+            row.enlisted,
+            row.org_status,
+            row.org_rank,
+            data.get('org_stars', 0),
+            data.get('verified', False),
+            row.last_updated,
+            row._raw_data,
+            content_hash
+        ))
+
+        if existing:
+            previous = dict(zip(TRACKED_MEMBER_FIELDS, existing[1:]))
+            previous['verified'] = bool(previous['verified'])
+            current = {
+                'handle': row.handle,
+                'org_status': row.org_status,
+                'org_rank': row.org_rank,
+                'org_stars': data.get('org_stars', 0),
+                'verified': bool(data.get('verified', False))
+            }
+            changed = [field for field in TRACKED_MEMBER_FIELDS if previous[field] != current[field]]
+            if not changed:
+                return row
+        else:
+            changed = list(TRACKED_MEMBER_FIELDS)
+
+        # Log verification transition
+        cursor.execute('''
+            INSERT INTO verification_history (
+                discord_id, action, status, timestamp, details
+            ) VALUES (?, ?, ?, ?, ?)
+        ''', (
+            discord_id,
+            'update' if existing else 'create',
+            True,
+            datetime.utcnow().isoformat(),
+            json.dumps({
+                'handle': data.get('handle'),
+                'org_status': data.get('org_status'),
+                'verified': data.get('verified'),
+                'changed': changed
+            })
+        ))
+        return row
+
+    def _log_role_change(self, conn: sqlite3.Connection, discord_id: str, old_rank: str,
+                         new_rank: str, reason: str):
+        """Insert a role history row without committing"""
+        conn.execute('''
+            INSERT INTO role_history (
+                discord_id, old_rank, new_rank, reason, timestamp
+            ) VALUES (?, ?, ?, ?, ?)
+        ''', (
+            discord_id,
+            old_rank,
+            new_rank,
+            reason,
+            datetime.utcnow().isoformat()
+        ))
+
+    def _queue_link(self, conn: sqlite3.Connection, discord_id: str, handle: str):
+        """Queue a link request without committing; a newer request replaces the old one"""
+        conn.execute('''
+            INSERT INTO pending_links (discord_id, handle, requested_at) VALUES (?, ?, ?)
+            ON CONFLICT(discord_id) DO UPDATE SET
+                handle = excluded.handle, requested_at = excluded.requested_at
+        ''', (discord_id, handle, datetime.utcnow().isoformat()))
+
+    def _remove_pending_link(self, conn: sqlite3.Connection, discord_id: str, handle: str):
+        """Drop a processed link request unless it was replaced in the meantime"""
+        conn.execute('DELETE FROM pending_links WHERE discord_id = ? AND handle = ?', (discord_id, handle))
+
+    def execute_write_batch(self, operations: List[Tuple[Callable, tuple]]) -> List[Tuple[bool, Any]]:
+        """Apply write operations in one transaction (one fsync for the whole batch).
+
+        Each operation is called as ``op(conn, *args)`` under its own savepoint,
+        so a failing operation is rolled back without discarding the others.
+        Returns a (success, result or exception) pair per operation.
+        """
+        conn = self._get_connection()
+        results = []
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            for op, args in operations:
+                conn.execute('SAVEPOINT write_op')
+                try:
+                    result = op(conn, *args)
+                    conn.execute('RELEASE write_op')
+                    results.append((True, result))
+                except Exception as e:
+                    conn.execute('ROLLBACK TO write_op')
+                    conn.execute('RELEASE write_op')
+                    results.append((False, e))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+        # Only committed rows may become visible through the cache or the counters
+        for (op, _), (success, result) in zip(operations, results):
+            if not success or op != self._store_member:
+                continue
+            if result is None:
+                self.member_writes_skipped += 1
+            else:
+                self.member_writes += 1
+                self.cache.put(result)
+        return results
+
+    def store_member(self, discord_id: str, data: Dict) -> bool:
+        """Store member RSI data in database"""
+        try:
+            (success, result), = self.execute_write_batch([(self._store_member, (discord_id, data))])
+            if not success:
+                raise result
+            if result is None:
+                logger.info(f"No changes for member {discord_id}, write skipped")
+            else:
                 logger.info(f"Successfully stored data for member {discord_id}")
-                return True
+            return True
         except Exception as e:
             logger.error(f"Error storing member data: {e}")
             return False
@@ -125,50 +614,46 @@ class RSIDatabase:
     def log_role_change(self, discord_id: str, old_rank: str, new_rank: str, reason: str) -> bool:
         """Log a role change in the history"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT INTO role_history (
-                        discord_id, old_rank, new_rank, reason, timestamp
-                    ) VALUES (?, ?, ?, ?, ?)
-                ''', (
-                    discord_id,
-                    old_rank,
-                    new_rank,
-                    reason,
-                    datetime.utcnow().isoformat()
-                ))
-                conn.commit()
-                return True
+            (success, result), = self.execute_write_batch(
+                [(self._log_role_change, (discord_id, old_rank, new_rank, reason))])
+            if not success:
+                raise result
+            return True
         except Exception as e:
             logger.error(f"Error logging role change: {e}")
             return False
 
     def get_member_by_discord_id(self, discord_id: str) -> Optional[Dict]:
         """Retrieve member data by Discord ID"""
+        if self.cache.complete:
+            row = self.cache.get_by_discord_id(discord_id)
+            return dict(row.data) if row else None
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute('SELECT raw_data FROM rsi_members WHERE discord_id = ?', (discord_id,))
                 result = cursor.fetchone()
                 
                 if result:
-                    return json.loads(result[0])
+                    return decode_raw_data(result[0])
                 return None
         except Exception as e:
             logger.error(f"Error retrieving member data: {e}")
             return None
 
     def get_member_by_handle(self, handle: str) -> Optional[Dict]:
-        """Retrieve member data by RSI handle"""
+        """Retrieve member data by RSI handle (case-insensitive)"""
+        if self.cache.complete:
+            row = self.cache.get_by_handle(handle)
+            return dict(row.data) if row else None
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute('SELECT raw_data FROM rsi_members WHERE handle = ?', (handle,))
+                cursor.execute('SELECT raw_data FROM rsi_members WHERE handle = ? COLLATE NOCASE', (handle,))
                 result = cursor.fetchone()
                 
                 if result:
-                    return json.loads(result[0])
+                    return decode_raw_data(result[0])
                 return None
         except Exception as e:
             logger.error(f"Error retrieving member data: {e}")
@@ -177,45 +662,220 @@ class RSIDatabase:
     def get_all_members(self) -> List[Dict]:
         """Retrieve all member data"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute('SELECT raw_data FROM rsi_members')
                 results = cursor.fetchall()
                 
-                return [json.loads(row[0]) for row in results]
+                return [decode_raw_data(row[0]) for row in results]
         except Exception as e:
             logger.error(f"Error retrieving all members: {e}")
             return []
 
+    def _load_raw_data(self, discord_id: str) -> Optional[bytes]:
+        """Fetch only the raw payload of a member, for lazy MemberRow decoding"""
+        cursor = self._get_connection().execute(
+            'SELECT raw_data FROM rsi_members WHERE discord_id = ?', (discord_id,))
+        result = cursor.fetchone()
+        return result[0] if result else None
+
+    def _fetch_member_row(self, where: str, params: tuple, with_raw_data: bool = False) -> Optional[MemberRow]:
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                if with_raw_data:
+                    cursor.execute(f'SELECT {MEMBER_COLUMNS}, raw_data FROM rsi_members WHERE {where}', params)
+                    result = cursor.fetchone()
+                    return MemberRow(*result) if result else None
+                cursor.execute(f'SELECT {MEMBER_COLUMNS} FROM rsi_members WHERE {where}', params)
+                result = cursor.fetchone()
+                return MemberRow(*result, loader=self._load_raw_data) if result else None
+        except Exception as e:
+            logger.error(f"Error retrieving member row: {e}")
+            return None
+
+    def get_member_row(self, discord_id: str, with_raw_data: bool = False) -> Optional[MemberRow]:
+        """Retrieve the typed columns of a member by Discord ID.
+
+        with_raw_data fetches the payload up front, so reading ``data`` later
+        never queries SQLite from the caller's thread (the event loop for the
+        async facade).
+        """
+        if self.cache.complete:
+            return self.cache.get_by_discord_id(discord_id)
+        return self._fetch_member_row('discord_id = ?', (discord_id,), with_raw_data)
+
+    def get_member_row_by_handle(self, handle: str, with_raw_data: bool = False) -> Optional[MemberRow]:
+        """Retrieve the typed columns of a member by RSI handle (case-insensitive)"""
+        if self.cache.complete:
+            return self.cache.get_by_handle(handle)
+        return self._fetch_member_row('handle = ? COLLATE NOCASE', (handle,), with_raw_data)
+
+    def get_member_rows(self, with_raw_data: bool = False) -> List[MemberRow]:
+        """Retrieve the typed columns of all members without decoding raw_data"""
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                if with_raw_data:
+                    cursor.execute(f'SELECT {MEMBER_COLUMNS}, raw_data FROM rsi_members')
+                    return [MemberRow(*row) for row in cursor.fetchall()]
+                cursor.execute(f'SELECT {MEMBER_COLUMNS} FROM rsi_members')
+                return [MemberRow(*row, loader=self._load_raw_data) for row in cursor.fetchall()]
+        except Exception as e:
+            logger.error(f"Error retrieving member rows: {e}")
+            return []
+
+    def _member_filter(self, query: Dict[str, Any]) -> Tuple[List[str], List[Any]]:
+        """Build WHERE clauses from a search_members style query"""
+        where_clauses = []
+        params = []
+        for key, value in query.items():
+            if key in ['discord_id', 'handle', 'sid', 'org_status', 'org_rank']:
+                where_clauses.append(f"{key} = ?")
+                params.append(value)
+        return where_clauses, params
+
     def search_members(self, query: Dict[str, any]) -> List[Dict]:
         """Search members based on criteria"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_connection() as conn:
                 cursor = conn.cursor()
                 
                 # Build WHERE clause from query
-                where_clauses = []
-                params = []
-                for key, value in query.items():
-                    if key in ['discord_id', 'handle', 'sid', 'org_status', 'org_rank']:
-                        where_clauses.append(f"{key} = ?")
-                        params.append(value)
+                where_clauses, params = self._member_filter(query)
                 
                 if where_clauses:
                     sql = f"SELECT raw_data FROM rsi_members WHERE {' AND '.join(where_clauses)}"
                     cursor.execute(sql, params)
                     results = cursor.fetchall()
-                    return [json.loads(row[0]) for row in results]
+                    return [decode_raw_data(row[0]) for row in results]
                 
                 return []
         except Exception as e:
             logger.error(f"Error searching members: {e}")
             return []
 
+    def _stream(self, sql: str, params: tuple, batch_size: int) -> Iterator[tuple]:
+        """Yield result rows fetched batch_size at a time from a dedicated cursor"""
+        cursor = self._get_connection().cursor()
+        try:
+            cursor.execute(sql, params)
+            while True:
+                batch = cursor.fetchmany(batch_size)
+                if not batch:
+                    break
+                yield from batch
+        except Exception as e:
+            logger.error(f"Error streaming members: {e}")
+        finally:
+            cursor.close()
+
+    def iter_members(self, batch_size: int = RSI_DB_STREAM_BATCH_SIZE) -> Iterator[Dict]:
+        """Stream all member data with bounded memory (generator form of get_all_members)"""
+        for row in self._stream('SELECT raw_data FROM rsi_members', (), batch_size):
+            yield decode_raw_data(row[0])
+
+    def iter_member_rows(self, batch_size: int = RSI_DB_STREAM_BATCH_SIZE) -> Iterator[MemberRow]:
+        """Stream the typed columns of all members without decoding raw_data"""
+        for row in self._stream(f'SELECT {MEMBER_COLUMNS} FROM rsi_members', (), batch_size):
+            yield MemberRow(*row, loader=self._load_raw_data)
+
+    def iter_search_members(self, query: Dict[str, Any],
+                            batch_size: int = RSI_DB_STREAM_BATCH_SIZE) -> Iterator[Dict]:
+        """Stream members matching the criteria (generator form of search_members)"""
+        where_clauses, params = self._member_filter(query)
+        if not where_clauses:
+            return
+        sql = f"SELECT raw_data FROM rsi_members WHERE {' AND '.join(where_clauses)}"
+        for row in self._stream(sql, tuple(params), batch_size):
+            yield decode_raw_data(row[0])
+
+    def lookup_members(self, text: str, limit: int = 25) -> List[MemberRow]:
+        """Find members by handle or display name for autocomplete.
+
+        Queries shorter than a trigram are matched as case-insensitive prefixes.
+        Longer ones match as substrings through the trigram index, then any
+        remaining slots are filled with fuzzy matches sharing the most trigrams.
+        Without SQLite trigram support they match as plain substrings.
+        Handle prefix matches sort first.
+        """
+        text = text.strip()
+        columns = ', '.join(f'm.{column.strip()}' for column in MEMBER_COLUMNS.split(','))
+        prefix = text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                if len(text) < 3 or not self.member_fts:
+                    # Without the trigram index longer queries match as substrings
+                    pattern = prefix if len(text) < 3 else '%' + prefix
+                    cursor.execute(f'''
+                        SELECT {columns} FROM rsi_members m
+                        WHERE m.handle LIKE ? ESCAPE '\\' OR m.display_name LIKE ? ESCAPE '\\'
+                        ORDER BY m.handle LIKE ? ESCAPE '\\' DESC, m.handle COLLATE NOCASE
+                        LIMIT ?
+                    ''', (pattern, pattern, prefix, limit))
+                    return [MemberRow(*row, loader=self._load_raw_data) for row in cursor.fetchall()]
+
+                phrase = '"' + text.replace('"', '""') + '"'
+                trigrams = ' OR '.join(
+                    '"' + text[i:i + 3].replace('"', '""') + '"' for i in range(len(text) - 2)
+                )
+                results = []
+                seen = set()
+                for match in (phrase, trigrams):
+                    cursor.execute(f'''
+                        SELECT {columns} FROM rsi_members_fts f
+                        JOIN rsi_members m ON m.discord_id = f.discord_id
+                        WHERE rsi_members_fts MATCH ?
+                        ORDER BY m.handle LIKE ? ESCAPE '\\' DESC, f.rank
+                        LIMIT ?
+                    ''', (match, prefix, limit))
+                    for row in cursor.fetchall():
+                        if row[0] not in seen:
+                            seen.add(row[0])
+                            results.append(MemberRow(*row, loader=self._load_raw_data))
+                    if len(results) >= limit:
+                        break
+                return results[:limit]
+        except Exception as e:
+            logger.error(f"Error looking up members: {e}")
+            return []
+
+    def get_member_rows_page(self, after_discord_id: Optional[str], limit: int) -> List[MemberRow]:
+        """Fetch the next page of member rows in discord_id order (keyset pagination)"""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            if after_discord_id is None:
+                cursor.execute(f'''
+                    SELECT {MEMBER_COLUMNS}, raw_data FROM rsi_members
+                    ORDER BY discord_id LIMIT ?
+                ''', (limit,))
+            else:
+                cursor.execute(f'''
+                    SELECT {MEMBER_COLUMNS}, raw_data FROM rsi_members
+                    WHERE discord_id > ? ORDER BY discord_id LIMIT ?
+                ''', (after_discord_id, limit))
+            return [MemberRow(*row) for row in cursor.fetchall()]
+
+    def get_pending_links(self) -> List[Dict]:
+        """Get queued link requests, oldest first"""
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute('SELECT discord_id, handle, requested_at FROM pending_links ORDER BY requested_at')
+                return [{
+                    'discord_id': row[0],
+                    'handle': row[1],
+                    'requested_at': row[2]
+                } for row in cursor.fetchall()]
+        except Exception as e:
+            logger.error(f"Error retrieving pending links: {e}")
+            return []
+
     def get_role_history(self, discord_id: str) -> List[Dict]:
         """Get role change history for a member"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     SELECT old_rank, new_rank, reason, timestamp
@@ -238,7 +898,7 @@ class RSIDatabase:
     def get_verification_history(self, discord_id: str) -> List[Dict]:
         """Get verification history for a member"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     SELECT action, status, timestamp, details
@@ -258,60 +918,323 @@ class RSIDatabase:
             logger.error(f"Error retrieving verification history: {e}")
             return []
 
-    def cleanup_old_records(self, days: int = 30) -> bool:
-        """Clean up old history records"""
+    def _reconstruct_roster(self, cursor: sqlite3.Cursor, snapshot_id: int) -> Dict[str, Dict]:
+        """Rebuild the indexed roster at a snapshot from its keyframe and later deltas"""
+        cursor.execute(
+            'SELECT id, roster FROM roster_snapshots WHERE keyframe = 1 AND id <= ? ORDER BY id DESC LIMIT 1',
+            (snapshot_id,)
+        )
+        keyframe_id, roster = cursor.fetchone()
+        members = index_roster(decode_raw_data(roster))
+        cursor.execute('''
+            SELECT handle, event, details FROM roster_events
+            WHERE snapshot_id > ? AND snapshot_id <= ?
+            ORDER BY snapshot_id, rowid
+        ''', (keyframe_id, snapshot_id))
+        return apply_roster_events(
+            members,
+            ((handle, event, decode_raw_data(details)) for handle, event, details in cursor.fetchall())
+        )
+
+    def _load_roster_snapshot(self, cursor: sqlite3.Cursor) -> Optional[Tuple[Dict, Dict[str, Dict]]]:
+        row = cursor.fetchone()
+        if not row:
+            return None
+        snapshot = dict(zip(('snapshot_id', 'taken_at', 'confirmed_at', 'member_count'), row))
+        return snapshot, self._reconstruct_roster(cursor, row[0])
+
+    def _set_latest_roster(self, latest: Tuple[Dict, Dict[str, Dict]]):
+        with self._roster_lock:
+            current = self._latest_roster
+            # A slow reader must not replace a newer snapshot recorded meanwhile
+            if current is None or latest[0]['snapshot_id'] >= current[0]['snapshot_id']:
+                self._latest_roster = latest
+
+    def store_roster(self, members: List[Dict]) -> Optional[Dict]:
+        """Record a fetched org roster as a delta against the previous snapshot.
+
+        An unchanged roster only refreshes confirmed_at. A full keyframe is
+        written for the first snapshot, every RSI_ROSTER_KEYFRAME_INTERVAL
+        snapshots, or when the delta would touch over half the roster. The
+        first snapshot records no events, so the existing roster does not
+        show up as joiners. Returns the event counts, or None on failure.
+        """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            current = index_roster(members)
+            now = datetime.utcnow().isoformat()
+            conn = self._get_connection()
+            with conn:
                 cursor = conn.cursor()
-                cutoff_date = (datetime.utcnow() - datetime.timedelta(days=days)).isoformat()
-                
-                # Clean up old history records
+                latest = self._latest_roster
+                if latest is None:
+                    cursor.execute(f'SELECT {ROSTER_SNAPSHOT_COLUMNS} FROM roster_snapshots ORDER BY id DESC LIMIT 1')
+                    latest = self._load_roster_snapshot(cursor)
+                # The first snapshot is a baseline: nobody joined, tracking started
+                events = diff_rosters(latest[1], current) if latest else []
+                counts = {ROSTER_JOINED: 0, ROSTER_LEFT: 0, ROSTER_CHANGED: 0}
+                for _, event, _ in events:
+                    counts[event] += 1
+
+                if latest and not events:
+                    snapshot = {**latest[0], 'confirmed_at': now}
+                    cursor.execute('UPDATE roster_snapshots SET confirmed_at = ? WHERE id = ?',
+                                   (now, snapshot['snapshot_id']))
+                    self._set_latest_roster((snapshot, latest[1]))
+                    return {'snapshot_id': snapshot['snapshot_id'], 'keyframe': False, **counts}
+
                 cursor.execute('''
-                    DELETE FROM role_history 
-                    WHERE timestamp < ?
-                ''', (cutoff_date,))
-                
+                    SELECT COUNT(*) FROM roster_snapshots
+                    WHERE id > (SELECT COALESCE(MAX(id), 0) FROM roster_snapshots WHERE keyframe = 1)
+                ''')
+                since_keyframe = cursor.fetchone()[0]
+                keyframe = (not latest or since_keyframe + 1 >= RSI_ROSTER_KEYFRAME_INTERVAL
+                            or len(events) * 2 > len(current))
+
                 cursor.execute('''
-                    DELETE FROM verification_history 
+                    INSERT INTO roster_snapshots (taken_at, confirmed_at, keyframe, member_count, roster)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (now, now, int(keyframe), len(current),
+                      encode_raw_data(list(current.values())) if keyframe else None))
+                snapshot_id = cursor.lastrowid
+                # Later keyframes record their events too, so event queries never have gaps
+                cursor.executemany(
+                    'INSERT INTO roster_events (snapshot_id, handle, event, details) VALUES (?, ?, ?, ?)',
+                    [(snapshot_id, handle, event, encode_raw_data(details))
+                     for handle, event, details in events]
+                )
+
+            snapshot = {'snapshot_id': snapshot_id, 'taken_at': now,
+                        'confirmed_at': now, 'member_count': len(current)}
+            self._set_latest_roster((snapshot, current))
+            logger.info(f"Stored roster snapshot {snapshot_id} (keyframe={keyframe}): {counts}")
+            return {'snapshot_id': snapshot_id, 'keyframe': keyframe, **counts}
+        except Exception as e:
+            logger.error(f"Error storing roster snapshot: {e}")
+            return None
+
+    def cached_roster(self) -> Optional[Dict]:
+        """Get the last-known roster if it is already in memory"""
+        latest = self._latest_roster
+        if latest is None:
+            return None
+        snapshot, members = latest
+        return {**snapshot, 'members': list(members.values())}
+
+    def get_latest_roster(self) -> Optional[Dict]:
+        """Get the last-known org roster with its snapshot times"""
+        try:
+            if self._latest_roster is None:
+                with self._get_connection() as conn:
+                    cursor = conn.cursor()
+                    cursor.execute(f'SELECT {ROSTER_SNAPSHOT_COLUMNS} FROM roster_snapshots ORDER BY id DESC LIMIT 1')
+                    latest = self._load_roster_snapshot(cursor)
+                if latest is None:
+                    return None
+                self._set_latest_roster(latest)
+            return self.cached_roster()
+        except Exception as e:
+            logger.error(f"Error loading latest roster: {e}")
+            return None
+
+    def get_roster_at(self, when: str) -> Optional[Dict]:
+        """Get the org roster as last recorded at or before an ISO timestamp"""
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(f'''
+                    SELECT {ROSTER_SNAPSHOT_COLUMNS} FROM roster_snapshots
+                    WHERE taken_at <= ? ORDER BY taken_at DESC, id DESC LIMIT 1
+                ''', (when,))
+                loaded = self._load_roster_snapshot(cursor)
+                if loaded is None:
+                    return None
+                snapshot, members = loaded
+                return {**snapshot, 'members': list(members.values())}
+        except Exception as e:
+            logger.error(f"Error loading roster snapshot: {e}")
+            return None
+
+    def get_roster_events(self, since: Optional[str] = None, until: Optional[str] = None,
+                          event: Optional[str] = None, handle: Optional[str] = None) -> List[Dict]:
+        """Get roster joins, leaves and changes, oldest first"""
+        clauses, params = [], []
+        if since:
+            clauses.append('s.taken_at >= ?')
+            params.append(since)
+        if until:
+            clauses.append('s.taken_at < ?')
+            params.append(until)
+        if event:
+            clauses.append('e.event = ?')
+            params.append(event)
+        if handle:
+            clauses.append('e.handle = ?')
+            params.append(handle)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(f'''
+                    SELECT s.taken_at, e.handle, e.event, e.details
+                    FROM roster_events e JOIN roster_snapshots s ON s.id = e.snapshot_id
+                    {where}
+                    ORDER BY e.snapshot_id, e.rowid
+                ''', params)
+                return [{
+                    'timestamp': row[0],
+                    'handle': row[1],
+                    'event': row[2],
+                    'details': decode_raw_data(row[3])
+                } for row in cursor.fetchall()]
+        except Exception as e:
+            logger.error(f"Error retrieving roster events: {e}")
+            return []
+
+    def delete_history_chunk(self, table: str, cutoff: str, chunk_size: int) -> int:
+        """Delete up to chunk_size history rows older than cutoff in one short transaction"""
+        if table not in HISTORY_TABLES:
+            raise ValueError(f"Not a history table: {table}")
+        with self._get_connection() as conn:
+            cursor = conn.execute(f'''
+                DELETE FROM {table}
+                WHERE id IN (
+                    SELECT id FROM {table}
                     WHERE timestamp < ?
-                ''', (cutoff_date,))
-                
-                conn.commit()
-                return True
+                    ORDER BY timestamp
+                    LIMIT ?
+                )
+            ''', (cutoff, chunk_size))
+            return cursor.rowcount
+
+    def recode_raw_data_chunk(self, chunk_size: int) -> Tuple[int, int]:
+        """Rewrite up to chunk_size legacy JSON raw_data values with the current codec.
+
+        Returns (rows rewritten, bytes saved).
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT discord_id, raw_data FROM rsi_members WHERE typeof(raw_data) = 'text' LIMIT ?",
+                (chunk_size,)
+            )
+            saved = 0
+            updates = []
+            for discord_id, raw_data in cursor.fetchall():
+                encoded = encode_raw_data(json.loads(raw_data))
+                saved += len(raw_data.encode('utf-8')) - len(encoded)
+                updates.append((encoded, discord_id))
+            cursor.executemany('UPDATE rsi_members SET raw_data = ? WHERE discord_id = ?', updates)
+            return len(updates), saved
+
+    def vacuum(self) -> int:
+        """Rebuild the database file compactly; returns the number of bytes reclaimed"""
+        conn = self._get_connection()
+        page_size = conn.execute('PRAGMA page_size').fetchone()[0]
+        before = conn.execute('PRAGMA page_count').fetchone()[0]
+        conn.execute('VACUUM')
+        after = conn.execute('PRAGMA page_count').fetchone()[0]
+        return (before - after) * page_size
+
+    def incremental_vacuum(self) -> int:
+        """Return free pages to the filesystem; returns the number of pages released"""
+        conn = self._get_connection()
+        before = conn.execute('PRAGMA freelist_count').fetchone()[0]
+        # executescript steps the pragma to completion; execute() frees a single page
+        conn.executescript('PRAGMA incremental_vacuum;')
+        after = conn.execute('PRAGMA freelist_count').fetchone()[0]
+        return before - after
+
+    def cleanup_old_records(self, days: Optional[int] = None,
+                            chunk_size: int = RSI_DB_RETENTION_CHUNK_SIZE) -> bool:
+        """Clean up old history records in bounded chunks (RSI_DB_RETENTION_DAYS unless days is set)"""
+        try:
+            for table in HISTORY_TABLES:
+                cutoff_date = (datetime.utcnow() - timedelta(
+                    days=RSI_DB_RETENTION_DAYS[table] if days is None else days)).isoformat()
+                while self.delete_history_chunk(table, cutoff_date, chunk_size) >= chunk_size:
+                    pass
+            self.incremental_vacuum()
+            return True
         except Exception as e:
             logger.error(f"Error cleaning up old records: {e}")
             return False
 
+    def _count_stats(self, cursor: sqlite3.Cursor) -> Dict:
+        """Compute member and history counts with full table scans"""
+        stats = {}
+        
+        # Get member counts
+        cursor.execute('SELECT COUNT(*) FROM rsi_members')
+        stats['total_members'] = cursor.fetchone()[0]
+        
+        cursor.execute('SELECT COUNT(*) FROM rsi_members WHERE verified = 1')
+        stats['verified_members'] = cursor.fetchone()[0]
+        
+        # Get org status breakdown, grouped like the counters: NULL and '' share a bucket
+        cursor.execute('''
+            SELECT IFNULL(org_status, ''), COUNT(*)
+            FROM rsi_members
+            GROUP BY 1
+        ''')
+        stats['org_status_breakdown'] = {
+            status or None: count for status, count in cursor.fetchall()
+        }
+        
+        # Get history counts
+        cursor.execute('SELECT COUNT(*) FROM role_history')
+        stats['role_changes'] = cursor.fetchone()[0]
+        
+        cursor.execute('SELECT COUNT(*) FROM verification_history')
+        stats['verification_events'] = cursor.fetchone()[0]
+        return stats
+
+    def _read_stat_counters(self, cursor: sqlite3.Cursor) -> Dict:
+        """Read the trigger-maintained counters in the same shape as _count_stats"""
+        cursor.execute('SELECT name, value FROM db_stats')
+        stats = {
+            'total_members': 0,
+            'verified_members': 0,
+            'org_status_breakdown': {},
+            'role_changes': 0,
+            'verification_events': 0
+        }
+        for name, value in cursor.fetchall():
+            if name.startswith('org_status:'):
+                if value:
+                    stats['org_status_breakdown'][name[len('org_status:'):] or None] = value
+            else:
+                stats[name] = value
+        return stats
+
     def get_database_stats(self) -> Dict:
-        """Get database statistics"""
+        """Get database statistics from the maintained counters"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                stats = {}
-                
-                # Get member counts
-                cursor.execute('SELECT COUNT(*) FROM rsi_members')
-                stats['total_members'] = cursor.fetchone()[0]
-                
-                cursor.execute('SELECT COUNT(*) FROM rsi_members WHERE verified = 1')
-                stats['verified_members'] = cursor.fetchone()[0]
-                
-                # Get org status breakdown
-                cursor.execute('''
-                    SELECT org_status, COUNT(*) 
-                    FROM rsi_members 
-                    GROUP BY org_status
-                ''')
-                stats['org_status_breakdown'] = dict(cursor.fetchall())
-                
-                # Get history counts
-                cursor.execute('SELECT COUNT(*) FROM role_history')
-                stats['role_changes'] = cursor.fetchone()[0]
-                
-                cursor.execute('SELECT COUNT(*) FROM verification_history')
-                stats['verification_events'] = cursor.fetchone()[0]
+            with self._get_connection() as conn:
+                stats = self._read_stat_counters(conn.cursor())
+                stats['member_cache'] = self.cache.stats()
+                stats['member_writes'] = {
+                    'written': self.member_writes,
+                    'skipped': self.member_writes_skipped
+                }
                 
                 return stats
         except Exception as e:
             logger.error(f"Error getting database stats: {e}")
-            return {}
\ No newline at end of file
+            return {}
+
+    def verify_stats(self) -> Dict:
+        """Compare the counters against real counts and rebuild them on drift"""
+        conn = self._get_connection()
+        with conn:
+            cursor = conn.cursor()
+            counters = self._read_stat_counters(cursor)
+            actual = self._count_stats(cursor)
+            drift = {
+                key: {'counter': counters[key], 'actual': actual[key]}
+                for key in actual if counters[key] != actual[key]
+            }
+            if drift:
+                logger.warning(f"Database stat counters drifted, rebuilding: {drift}")
+                for statement in STATS_RECOUNT:
+                    cursor.execute(statement)
+        return {'consistent': not drift, 'drift': drift}
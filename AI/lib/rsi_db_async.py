@@ -0,0 +1,396 @@
+import asyncio
+import functools
+import logging
+import queue
+import threading
+import time
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, Dict, List, Callable, Any, AsyncIterator
+from lib.constants import (
+    RSI_DB_READER_THREADS,
+    RSI_DB_WRITE_BATCH_SIZE,
+    RSI_DB_FLUSH_INTERVAL,
+    RSI_DB_RETENTION_DAYS,
+    RSI_DB_RETENTION_CHUNK_SIZE,
+    RSI_DB_STREAM_BATCH_SIZE,
+    RSI_DB_BACKUP_DIR
+)
+from lib.db_backup import backup_database
+from lib.rsi_db import RSIDatabase, MemberRow
+
+logger = logging.getLogger('DraXon_AI')
+
+class _WriteJob:
+    __slots__ = ('func', 'args', 'batched', 'future', 'loop')
+
+    def __init__(self, func: Callable, args: tuple, batched: bool,
+                 future: asyncio.Future, loop: asyncio.AbstractEventLoop):
+        self.func = func
+        self.args = args
+        self.batched = batched
+        self.future = future
+        self.loop = loop
+
+    def resolve(self, result: Any = None, error: Optional[BaseException] = None):
+        """Complete the awaiting future from the writer thread"""
+        def _set():
+            if self.future.done():
+                return
+            if error is not None:
+                self.future.set_exception(error)
+            else:
+                self.future.set_result(result)
+        self.loop.call_soon_threadsafe(_set)
+
+class BatchWriter:
+    """Single writer thread that group-commits queued writes.
+
+    Batched jobs are coalesced into one transaction per flush interval or
+    batch size, whichever comes first. Unbatched jobs (maintenance work that
+    manages its own transactions) run alone between batches.
+    """
+
+    def __init__(self, db: RSIDatabase, batch_size: int = RSI_DB_WRITE_BATCH_SIZE,
+                 flush_interval: float = RSI_DB_FLUSH_INTERVAL):
+        self.db = db
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.writes = 0
+        self.batches = 0
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='rsi-db-writer', daemon=True)
+        self._thread.start()
+
+    def submit(self, job: _WriteJob):
+        self._queue.put(job)
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            job = self._queue.get()
+            if job is None:
+                break
+            if not job.batched:
+                self._run_exclusive(job)
+                continue
+
+            batch = [job]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    job = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if job is None:
+                    stopping = True
+                    break
+                if not job.batched:
+                    self._flush(batch)
+                    batch = []
+                    self._run_exclusive(job)
+                    break
+                batch.append(job)
+            self._flush(batch)
+
+        # Drain anything queued behind the shutdown marker
+        remaining = []
+        while True:
+            try:
+                job = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if job is None:
+                continue
+            if job.batched:
+                remaining.append(job)
+            else:
+                self._flush(remaining)
+                remaining = []
+                self._run_exclusive(job)
+        self._flush(remaining)
+
+    def _run_exclusive(self, job: _WriteJob):
+        try:
+            job.resolve(job.func(*job.args))
+        except Exception as e:
+            job.resolve(error=e)
+
+    def _flush(self, batch: List[_WriteJob]):
+        if not batch:
+            return
+        try:
+            results = self.db.execute_write_batch([(job.func, job.args) for job in batch])
+        except Exception as e:
+            logger.error(f"Error committing write batch of {len(batch)}: {e}")
+            results = [(False, e)] * len(batch)
+        self.writes += len(batch)
+        self.batches += 1
+        for job, (success, result) in zip(batch, results):
+            if not success:
+                logger.error(f"Error in batched database write: {result}")
+            job.resolve(success)
+
+    def stop(self):
+        """Flush everything queued so far and stop the writer thread"""
+        self._queue.put(None)
+        self._thread.join()
+
+class AsyncRSIDatabase:
+    """Awaitable facade over RSIDatabase that keeps SQLite work off the event loop.
+
+    Writes go through a single group-committing writer thread; reads are
+    spread over a small pool of reader threads, each holding its own pooled
+    WAL connection. Write methods enqueue immediately and return an awaitable,
+    so callers can issue many writes and await them together to share a commit.
+    """
+
+    def __init__(self, db_path: Path, reader_threads: int = RSI_DB_READER_THREADS):
+        self.db = RSIDatabase(db_path)
+        self._writer = BatchWriter(self.db)
+        self._readers = ThreadPoolExecutor(max_workers=reader_threads, thread_name_prefix='rsi-db-reader')
+        self._closed = False
+
+    def _check_open(self):
+        if self._closed:
+            raise RuntimeError("RSI database has been closed")
+
+    async def _read(self, func: Callable, *args) -> Any:
+        self._check_open()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._readers, functools.partial(func, *args))
+
+    def _submit(self, func: Callable, args: tuple, batched: bool) -> asyncio.Future:
+        self._check_open()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._writer.submit(_WriteJob(func, args, batched, future, loop))
+        return future
+
+    def _write(self, op: Callable, *args) -> asyncio.Future:
+        """Queue a transaction-free write op for the next group commit"""
+        return self._submit(op, args, batched=True)
+
+    def _write_exclusive(self, func: Callable, *args) -> asyncio.Future:
+        """Queue work that manages its own transactions on the writer thread"""
+        return self._submit(func, args, batched=False)
+
+    def store_member(self, discord_id: str, data: Dict) -> asyncio.Future:
+        """Store member RSI data in database (awaitable, resolves to success)"""
+        return self._write(self.db._store_member, discord_id, data)
+
+    def log_role_change(self, discord_id: str, old_rank: str, new_rank: str, reason: str) -> asyncio.Future:
+        """Log a role change in the history (awaitable, resolves to success)"""
+        return self._write(self.db._log_role_change, discord_id, old_rank, new_rank, reason)
+
+    def queue_link(self, discord_id: str, handle: str) -> asyncio.Future:
+        """Queue a link request for after the maintenance window (awaitable, resolves to success)"""
+        return self._write(self.db._queue_link, discord_id, handle)
+
+    def remove_pending_link(self, discord_id: str, handle: str) -> asyncio.Future:
+        """Drop a processed link request (awaitable, resolves to success)"""
+        return self._write(self.db._remove_pending_link, discord_id, handle)
+
+    async def get_pending_links(self) -> List[Dict]:
+        """Get queued link requests, oldest first"""
+        return await self._read(self.db.get_pending_links)
+
+    async def flush(self):
+        """Wait until every write queued so far has been committed"""
+        await self._write(lambda conn: None)
+
+    def write_stats(self) -> Dict:
+        """Get group-commit counters for the writer thread"""
+        return {
+            'writes': self._writer.writes,
+            'batches': self._writer.batches,
+            'queue_depth': self._writer.queue_depth(),
+            'members_written': self.db.member_writes,
+            'members_skipped': self.db.member_writes_skipped
+        }
+
+    async def cleanup_old_records(self, days: Optional[int] = None) -> bool:
+        """Clean up old history records through run_retention; days overrides every table's retention"""
+        retention_days = RSI_DB_RETENTION_DAYS if days is None else {table: days for table in RSI_DB_RETENTION_DAYS}
+        try:
+            await self.run_retention(retention_days)
+            return True
+        except Exception as e:
+            logger.error(f"Error cleaning up old records: {e}")
+            return False
+
+    async def run_retention(self, retention_days: Dict[str, int] = RSI_DB_RETENTION_DAYS,
+                            chunk_size: int = RSI_DB_RETENTION_CHUNK_SIZE) -> Dict:
+        """Delete expired history in bounded chunks, then release the freed pages.
+
+        Each chunk is its own short transaction on the writer thread, and the
+        event loop is yielded to between chunks so queued writes interleave.
+        """
+        start = time.perf_counter()
+        removed = {}
+        for table, days in retention_days.items():
+            cutoff = (datetime.utcnow() - timedelta(days=days)).isoformat()
+            removed[table] = 0
+            while True:
+                deleted = await self._write_exclusive(self.db.delete_history_chunk, table, cutoff, chunk_size)
+                removed[table] += deleted
+                if deleted < chunk_size:
+                    break
+                await asyncio.sleep(0)
+
+        pages_freed = await self._write_exclusive(self.db.incremental_vacuum)
+        report = {
+            'removed': removed,
+            'pages_freed': pages_freed,
+            'seconds': round(time.perf_counter() - start, 3)
+        }
+        logger.info(f"History retention finished: {report}")
+        return report
+
+    async def recode_raw_data(self, chunk_size: int = RSI_DB_RETENTION_CHUNK_SIZE) -> Dict:
+        """Rewrite legacy JSON raw_data rows with the compressed codec, one chunk at a time"""
+        start = time.perf_counter()
+        rows = 0
+        saved = 0
+        while True:
+            rewritten, chunk_saved = await self._write_exclusive(self.db.recode_raw_data_chunk, chunk_size)
+            rows += rewritten
+            saved += chunk_saved
+            if rewritten < chunk_size:
+                break
+            await asyncio.sleep(0)
+
+        # Shrunken rows leave pages partly empty rather than free, so compact once
+        reclaimed = await self._write_exclusive(self.db.vacuum) if rows else 0
+        report = {
+            'rows': rows,
+            'bytes_saved': saved,
+            'bytes_reclaimed': reclaimed,
+            'seconds': round(time.perf_counter() - start, 3)
+        }
+        if rows:
+            logger.info(f"raw_data codec migration finished: {report}")
+        return report
+
+    async def backup(self, backup_dir: Path = RSI_DB_BACKUP_DIR) -> Dict:
+        """Snapshot the live database on its own thread and connection.
+
+        The online backup copies pages in small steps, so the reader and
+        writer threads carry on while it runs.
+        """
+        self._check_open()
+        return await asyncio.to_thread(backup_database, self.db.db_path, backup_dir)
+
+    async def get_member_by_discord_id(self, discord_id: str) -> Optional[Dict]:
+        """Retrieve member data by Discord ID"""
+        if self.db.cache.complete:
+            # Served from memory, no need to hop onto a reader thread
+            return self.db.get_member_by_discord_id(discord_id)
+        return await self._read(self.db.get_member_by_discord_id, discord_id)
+
+    async def get_member_by_handle(self, handle: str) -> Optional[Dict]:
+        """Retrieve member data by RSI handle"""
+        if self.db.cache.complete:
+            return self.db.get_member_by_handle(handle)
+        return await self._read(self.db.get_member_by_handle, handle)
+
+    async def get_member_row(self, discord_id: str) -> Optional[MemberRow]:
+        """Retrieve the typed columns of a member by Discord ID"""
+        if self.db.cache.complete:
+            return self.db.get_member_row(discord_id)
+        # Rows come back with raw_data so decoding .data on the event loop never hits SQLite
+        return await self._read(self.db.get_member_row, discord_id, True)
+
+    async def get_member_row_by_handle(self, handle: str) -> Optional[MemberRow]:
+        """Retrieve the typed columns of a member by RSI handle"""
+        if self.db.cache.complete:
+            return self.db.get_member_row_by_handle(handle)
+        return await self._read(self.db.get_member_row_by_handle, handle, True)
+
+    async def get_member_rows(self) -> List[MemberRow]:
+        """Retrieve the typed columns of all members without decoding raw_data"""
+        return await self._read(self.db.get_member_rows, True)
+
+    async def lookup_members(self, text: str, limit: int = 25) -> List[MemberRow]:
+        """Find members by handle or display name for autocomplete"""
+        return await self._read(self.db.lookup_members, text, limit)
+
+    async def get_all_members(self) -> List[Dict]:
+        """Retrieve all member data"""
+        return await self._read(self.db.get_all_members)
+
+    async def iter_member_rows(self, batch_size: int = RSI_DB_STREAM_BATCH_SIZE) -> AsyncIterator[MemberRow]:
+        """Stream all member rows, fetching one keyset page per reader-thread hop"""
+        after = None
+        while True:
+            page = await self._read(self.db.get_member_rows_page, after, batch_size)
+            for row in page:
+                yield row
+            if len(page) < batch_size:
+                break
+            after = page[-1].discord_id
+
+    async def iter_members(self, batch_size: int = RSI_DB_STREAM_BATCH_SIZE) -> AsyncIterator[Dict]:
+        """Stream all member data with bounded memory"""
+        async for row in self.iter_member_rows(batch_size):
+            yield row.data
+
+    async def search_members(self, query: Dict[str, Any]) -> List[Dict]:
+        """Search members based on criteria"""
+        return await self._read(self.db.search_members, query)
+
+    async def get_role_history(self, discord_id: str) -> List[Dict]:
+        """Get role change history for a member"""
+        return await self._read(self.db.get_role_history, discord_id)
+
+    async def get_verification_history(self, discord_id: str) -> List[Dict]:
+        """Get verification history for a member"""
+        return await self._read(self.db.get_verification_history, discord_id)
+
+    def store_roster(self, members: List[Dict]) -> asyncio.Future:
+        """Record a fetched org roster as a snapshot delta (awaitable, resolves to event counts)"""
+        return self._write_exclusive(self.db.store_roster, members)
+
+    async def get_latest_roster(self) -> Optional[Dict]:
+        """Get the last-known org roster, from memory once loaded"""
+        cached = self.db.cached_roster()
+        if cached is not None:
+            return cached
+        return await self._read(self.db.get_latest_roster)
+
+    async def get_roster_at(self, when: str) -> Optional[Dict]:
+        """Get the org roster as recorded at or before an ISO timestamp"""
+        return await self._read(self.db.get_roster_at, when)
+
+    async def get_roster_events(self, since: Optional[str] = None, until: Optional[str] = None,
+                                event: Optional[str] = None, handle: Optional[str] = None) -> List[Dict]:
+        """Get roster joins, leaves and changes, oldest first"""
+        return await self._read(self.db.get_roster_events, since, until, event, handle)
+
+    async def get_database_stats(self) -> Dict:
+        """Get database statistics"""
+        return await self._read(self.db.get_database_stats)
+
+    async def verify_stats(self) -> Dict:
+        """Check the stat counters against real counts, rebuilding them on drift"""
+        return await self._write_exclusive(self.db.verify_stats)
+
+    def _shutdown(self):
+        self._writer.stop()
+        self._readers.shutdown(wait=True)
+        self.db.close()
+
+    async def close(self):
+        """Commit every queued write, stop the worker threads and close all connections"""
+        if self._closed:
+            return
+        self._closed = True
+        await asyncio.to_thread(self._shutdown)
+        logger.info("RSI database closed")